@@ -22,6 +22,11 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Same schema the models and migrations use (POSTGRES_SCHEMA)
+SCHEMA = _config.POSTGRES_SCHEMA
+# pg_advisory_lock key: replicas starting together run migrations one at a time
+MIGRATION_LOCK_ID = 0x61707074  # "appt"
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,12 +53,12 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
-        version_table_schema='appointment_report',  # Ensure alembic_version is in correct schema
+        version_table_schema=SCHEMA,  # Ensure alembic_version is in correct schema
         version_table="alembic_version",
         include_schemas=False, 
-        default_schema_name="appointment_report",
+        default_schema_name=SCHEMA,
         include_object=lambda obj, name, type_, reflected, compare_to: (
-            obj.schema == "appointment_report" if hasattr(obj, "schema") else False
+            obj.schema == SCHEMA if hasattr(obj, "schema") else False
         )
     )
 
@@ -82,7 +87,12 @@ def run_migrations_online() -> None:
 
 
     with connectable.connect() as connection:
-        connection.execute(text(f"SET search_path TO appointment_report;"))
+        connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        connection.commit()
+        # Previously done by the app at import time; migrations now own schema creation
+        schema = connection.dialect.identifier_preparer.quote_schema(SCHEMA)
+        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        connection.execute(text(f"SET search_path TO {schema};"))
         connection.commit()
         # create_alembic_version_table(connection)
 
@@ -90,14 +100,18 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
-            version_table_schema='appointment_report',  # Ensure alembic_version is in correct schema
+            version_table_schema=SCHEMA,  # Ensure alembic_version is in correct schema
             version_table="alembic_version",
             include_schemas=False,  
-            default_schema_name="appointment_report"
+            default_schema_name=SCHEMA
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        try:
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+            connection.commit()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,66 @@
+"""create appointment tables
+
+Revision ID: 5b2e8c41d7a3
+Revises: 
+Create Date: 2026-10-18 10:12:40.118205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import config
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8c41d7a3'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = config.POSTGRES_SCHEMA
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases bootstrapped by create_all() already have these tables
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("appointments", schema=SCHEMA):
+        op.create_table(
+            "appointments",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("patient_id", sa.Integer()),
+            sa.Column("doctor_id", sa.Integer()),
+            sa.Column("appointment_date", sa.DateTime(), nullable=False),
+            sa.Column("notes", sa.String(), nullable=True),
+            sa.Column(
+                "status",
+                sa.Enum("PENDING", "CONFIRMED", "CANCELLED", "COMPLETED", name="appointment_status_enum", schema=SCHEMA),
+            ),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()")),
+            schema=SCHEMA,
+        )
+        op.create_index(f"ix_{SCHEMA}_appointments_id", "appointments", ["id"], schema=SCHEMA)
+
+    if not inspector.has_table("doctor_reports", schema=SCHEMA):
+        op.create_table(
+            "doctor_reports",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("doctor_id", sa.Integer()),
+            sa.Column("month", sa.Integer(), nullable=False),
+            sa.Column("year", sa.Integer(), nullable=False),
+            sa.Column("total_patient_visits", sa.Integer()),
+            sa.Column("total_appointments", sa.Integer()),
+            sa.Column("total_earnings", sa.Float()),
+            sa.Column("generated_at", sa.Date(), server_default=sa.func.now()),
+            schema=SCHEMA,
+        )
+        op.create_index(f"ix_{SCHEMA}_doctor_reports_id", "doctor_reports", ["id"], schema=SCHEMA)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("doctor_reports", schema=SCHEMA)
+    op.drop_table("appointments", schema=SCHEMA)
+    sa.Enum(name="appointment_status_enum", schema=SCHEMA).drop(op.get_bind(), checkfirst=True)
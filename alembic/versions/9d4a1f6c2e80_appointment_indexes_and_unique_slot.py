@@ -0,0 +1,120 @@
+"""appointment indexes and unique booked slot
+
+Revision ID: 9d4a1f6c2e80
+Revises: 5b2e8c41d7a3
+Create Date: 2026-10-18 10:31:07.402916
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import config
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4a1f6c2e80'
+down_revision: Union[str, None] = '5b2e8c41d7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = config.POSTGRES_SCHEMA
+
+# appointment_status_enum stores the enum member names, not their values
+NOT_CANCELLED = sa.text("status <> 'CANCELLED'")
+CANCELLED = sa.literal_column("'CANCELLED'")
+
+appointments = sa.table(
+    "appointments",
+    sa.column("id"), sa.column("doctor_id"), sa.column("appointment_date"), sa.column("status"),
+    schema=SCHEMA,
+)
+
+
+def cancel_double_bookings() -> None:
+    """
+    The old check-then-insert booking could race into two live appointments for one
+    doctor slot; keep the earliest booking and cancel the rest so the unique index builds.
+    """
+    earlier = appointments.alias("earlier")
+    op.execute(
+        appointments.update()
+        .where(
+            appointments.c.status != CANCELLED,
+            sa.exists().where(
+                earlier.c.doctor_id == appointments.c.doctor_id,
+                earlier.c.appointment_date == appointments.c.appointment_date,
+                earlier.c.status != CANCELLED,
+                earlier.c.id < appointments.c.id,
+            ),
+        )
+        .values(status=CANCELLED)
+    )
+
+
+def drop_index_if_invalid(name: str) -> None:
+    """
+    A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind, which IF NOT EXISTS
+    would then skip; a unique one that never enforces anything must be rebuilt instead.
+    """
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index i"
+            " JOIN pg_class c ON c.oid = i.indexrelid"
+            " JOIN pg_namespace n ON n.oid = c.relnamespace"
+            " WHERE c.relname = :name AND n.nspname = :schema AND NOT i.indisvalid"
+        ),
+        {"name": name, "schema": SCHEMA},
+    ).first()
+    if invalid:
+        op.drop_index(name, table_name="appointments", schema=SCHEMA, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    cancel_double_bookings()
+
+    # CONCURRENTLY cannot run inside a transaction; it keeps the table writable while indexes build
+    with op.get_context().autocommit_block():
+        for name in (
+            "ix_appointments_doctor_id_appointment_date",
+            "ix_appointments_patient_id_appointment_date",
+            "ix_appointments_status_appointment_date",
+            "uq_appointments_doctor_slot",
+        ):
+            drop_index_if_invalid(name)
+        op.create_index(
+            "ix_appointments_doctor_id_appointment_date", "appointments",
+            ["doctor_id", "appointment_date"],
+            schema=SCHEMA, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_appointments_patient_id_appointment_date", "appointments",
+            ["patient_id", "appointment_date"],
+            schema=SCHEMA, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_appointments_status_appointment_date", "appointments",
+            ["status", "appointment_date"],
+            schema=SCHEMA, postgresql_concurrently=True, if_not_exists=True,
+        )
+        # No IF NOT EXISTS: a leftover that escaped the check above must fail loudly, not be stamped
+        op.create_index(
+            "uq_appointments_doctor_slot", "appointments",
+            ["doctor_id", "appointment_date"],
+            unique=True, postgresql_where=NOT_CANCELLED,
+            schema=SCHEMA, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in (
+            "uq_appointments_doctor_slot",
+            "ix_appointments_status_appointment_date",
+            "ix_appointments_patient_id_appointment_date",
+            "ix_appointments_doctor_id_appointment_date",
+        ):
+            op.drop_index(name, table_name="appointments", schema=SCHEMA,
+                          postgresql_concurrently=True, if_exists=True)
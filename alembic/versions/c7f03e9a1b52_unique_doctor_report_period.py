@@ -0,0 +1,53 @@
+"""unique doctor report per month
+
+Revision ID: c7f03e9a1b52
+Revises: 9d4a1f6c2e80
+Create Date: 2026-10-18 11:04:52.631774
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import config
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f03e9a1b52'
+down_revision: Union[str, None] = '9d4a1f6c2e80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = config.POSTGRES_SCHEMA
+
+doctor_reports = sa.table(
+    "doctor_reports",
+    sa.column("id"), sa.column("doctor_id"), sa.column("year"), sa.column("month"),
+    schema=SCHEMA,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Regenerating a report used to insert a fresh full row each time, so the newest row
+    # per period is the complete one; drop the older copies before enforcing uniqueness
+    newer = doctor_reports.alias("newer")
+    op.execute(
+        doctor_reports.delete().where(
+            sa.exists().where(
+                newer.c.doctor_id == doctor_reports.c.doctor_id,
+                newer.c.year == doctor_reports.c.year,
+                newer.c.month == doctor_reports.c.month,
+                newer.c.id > doctor_reports.c.id,
+            )
+        )
+    )
+    op.create_unique_constraint(
+        "uq_doctor_reports_doctor_period", "doctor_reports",
+        ["doctor_id", "year", "month"], schema=SCHEMA,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_doctor_reports_doctor_period", "doctor_reports", type_="unique", schema=SCHEMA)
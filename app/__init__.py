@@ -1,23 +1,15 @@
 import logging
-
-from fastapi import FastAPI, Depends
-from fastapi.openapi.utils import get_openapi
+from typing import TYPE_CHECKING
 
 from app.config import config
-from app.db.models.models import Base
-from app.db.session import engine
-from app.routers.user_auth_router import user_auth_router
-from app.routers.location import location_router
-from app.routers.appointment_router import appointment_router
-from app.routers.health_router import health_router
 
-from app.dependencies.auth import get_current_user
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
 
+def custom_openapi(app: "FastAPI"):
+    from fastapi.openapi.utils import get_openapi
 
-def create_tables():         
-	Base.metadata.create_all(bind=engine)
-      
-def custom_openapi(app: FastAPI):
     if app.openapi_schema:
         return app.openapi_schema
     openapi_schema = get_openapi(title=config.PROJECT_NAME, version=config.PROJECT_VERSION,routes=app.routes)
@@ -35,14 +27,35 @@ def custom_openapi(app: FastAPI):
         
 
 def start_application():
+    # Imported here so `import app.services...` (Celery workers, scripts) doesn't build the web app
+    from fastapi import FastAPI
+
+    from app.db.query_profiler import QueryProfilerMiddleware
+    from app.db.session import dispose_engines
+    from app.routers.appointment_router import appointment_router
+    from app.routers.health_router import health_router
+    from app.routers.location import location_router
+    from app.routers.metrics_router import metrics_router
+    from app.routers.report_router import report_router
+    from app.services.cache_user_service import start_user_cache_listener, stop_user_cache_listener
+    from app.utils.request_metrics import RequestMetricsMiddleware
+
     app = FastAPI(title=config.PROJECT_NAME, version=config.PROJECT_VERSION,docs_url=f"{config.API_PREFIX}/api-docs",openapi_url=f"{config.API_PREFIX}/openapi.json")
-    create_tables()
     logging.basicConfig()
-    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
-    app.include_router(user_auth_router)
+    logging.getLogger("app").setLevel(logging.INFO)
+    if config.SQL_ECHO:
+        # Every statement, formatted on the request path; for local debugging only
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
     app.include_router(location_router)
     app.include_router(appointment_router)
     app.include_router(health_router)
+    app.include_router(report_router)
+    app.include_router(metrics_router)
+    app.add_middleware(QueryProfilerMiddleware)
+    app.add_middleware(RequestMetricsMiddleware)
+    app.add_event_handler("startup", start_user_cache_listener)
+    app.add_event_handler("shutdown", stop_user_cache_listener)
+    app.add_event_handler("shutdown", dispose_engines)
     # custom_openapi(app)
     return app
 
@@ -1,5 +1,6 @@
 
 from app.config import config
+from app.db.query_profiler import register_task_profiler
 from celery import Celery
 from celery.schedules import crontab
 
@@ -12,16 +13,25 @@ def create_celery_app():
     # Set timezone
     celery_app.conf.timezone = 'Asia/Dhaka'
 
+    # Statement counts and N+1 warnings per task run, like QueryProfilerMiddleware for requests
+    register_task_profiler()
+
     # Periodic task schedules
     celery_app.conf.beat_schedule = {
-        "send-daily-reminders": {
-        "task": "app.services.reminder.send_daily_appointment_reminders",
-        "schedule": crontab(hour=8, minute=0),
+        # Per-appointment reminder timers; they replace the daily full scan, and
+        # every beat start re-arms any that are missing (see reminder.py)
+        "drain-due-reminders": {
+            "task": "app.services.reminder.drain_due_reminders",
+            "schedule": float(config.REMINDER_POLL_INTERVAL),
         },
         "generate-monthly-reports": {
             "task": "app.services.reports.generate_monthly_report",
             "schedule": crontab(day_of_month="1", hour=2, minute=0),  # 1st of every month at 2 AM
         },
+        "reconcile-doctor-reports": {
+            "task": "app.services.reports.reconcile_doctor_reports",
+            "schedule": crontab(minute=15),  # hourly; incremental rollups keep reports fresh in between
+        },
     }
 
     return celery_app
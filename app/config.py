@@ -4,10 +4,8 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 env_path = Path('.') / '.env.dev'
-print(f"Loading .env file from: {env_path}")  # Debugging
 load_dotenv(dotenv_path=env_path)
 
-print(f"API_PREFIX from .env: {os.getenv('API_PREFIX')}")  # Debugging
 class Config():
     PROJECT_NAME:str = "Auth Service"
     PROJECT_VERSION: str = "1.0.0"
@@ -16,6 +14,10 @@ class Config():
     JWT_ALGORITHM:str = os.getenv('JWT_ALGORITHM')
     JWT_ACCESS_TOKEN_EXPIRES:int=os.getenv('JWT_ACCESS_TOKEN_EXPIRES')
     JWT_REFRESH_TOKEN_EXPIRES:int=os.getenv('JWT_REFRESH_TOKEN_EXPIRES')
+    # Verified token payloads cached per process; an entry lives until the token's
+    # exp or JWT_CACHE_TTL seconds, whichever comes first (0 disables the cache)
+    JWT_CACHE_MAXSIZE: int = int(os.getenv("JWT_CACHE_MAXSIZE", 10000))
+    JWT_CACHE_TTL: int = int(os.getenv("JWT_CACHE_TTL", 300))
     
 
     POSTGRES_USER : str = os.getenv("POSTGRES_USER","postgres")
@@ -25,6 +27,37 @@ class Config():
     POSTGRES_DB : str = os.getenv("POSTGRES_DB","business_automation")
     POSTGRES_SCHEMA: str = os.getenv("POSTGRES_SCHEMA", "public")
     DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+    # Same database through asyncpg, for the async endpoints
+    ASYNC_DATABASE_URL = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
+
+    # gunicorn worker processes (gunicorn.conf.py). Capped by default rather than one per
+    # core, since every worker opens its own connection pools (see DB_MAX_CONNECTIONS)
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", min(os.cpu_count() or 1, 4)))
+
+    # SQLAlchemy connection pools, per engine and per process. Each web worker has two
+    # engines (sync psycopg2 and async asyncpg), so the server can hold up to
+    #   WEB_CONCURRENCY * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    # connections. Unless set explicitly, the pool sizes are derived so that stays within
+    # DB_MAX_CONNECTIONS: DB_MAX_CONNECTIONS // (2 * WEB_CONCURRENCY) per engine (at least 2),
+    # half kept open and half overflow. Leave headroom under Postgres' max_connections (100 by
+    # default) for Celery workers, migrations and admin sessions.
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", 60))
+    _DB_CONNECTIONS_PER_ENGINE = max(2, DB_MAX_CONNECTIONS // (2 * max(1, WEB_CONCURRENCY)))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", _DB_CONNECTIONS_PER_ENGINE // 2))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", _DB_CONNECTIONS_PER_ENGINE - _DB_CONNECTIONS_PER_ENGINE // 2))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", 30))  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))  # seconds; -1 disables
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 30000))  # 0 disables
+
+    # Query profiling: share of requests and of Celery task runs profiled, repeats of one
+    # statement shape in a request or task that count as N+1, slow-query log threshold,
+    # and full SQL echo (debug only)
+    QUERY_PROFILE_SAMPLE_RATE: float = float(os.getenv("QUERY_PROFILE_SAMPLE_RATE", 0.1))
+    QUERY_PROFILE_TASK_SAMPLE_RATE: float = float(os.getenv("QUERY_PROFILE_TASK_SAMPLE_RATE", 1.0))
+    QUERY_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", 10))
+    SLOW_QUERY_MS: int = int(os.getenv("SLOW_QUERY_MS", 250))  # 0 disables
+    SQL_ECHO: bool = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
 
     CELERY = {
         "broker_url": os.getenv("BROKER_URL"),
@@ -37,6 +70,56 @@ class Config():
     X_API_KEY_BACKEND: str = os.getenv('X_API_KEY_BACKEND')
 
 
+    REDIS_HOST: str = os.getenv("REDIS_HOST", "redis")
+    REDIS_PORT: int = int(os.getenv("REDIS_PORT", 6379))
+
+    # In-process L1 cache in front of the Redis `user:{id}` records
+    USER_CACHE_L1_MAXSIZE: int = int(os.getenv("USER_CACHE_L1_MAXSIZE", 2048))
+    USER_CACHE_L1_TTL: int = int(os.getenv("USER_CACHE_L1_TTL", 60))  # seconds
+    # Let the listener turn on the Redis keyspace events it needs (CONFIG SET notify-keyspace-events).
+    # Off by default: Redis may be shared, so enable "K$gx" there or opt in here.
+    USER_CACHE_CONFIGURE_KEYSPACE_EVENTS: bool = os.getenv("USER_CACHE_CONFIGURE_KEYSPACE_EVENTS", "false").lower() in ("1", "true", "yes")
+
+    # Length of one bookable slot, used when searching a doctor's free slots
+    APPOINTMENT_SLOT_MINUTES: int = int(os.getenv("APPOINTMENT_SLOT_MINUTES", 30))
+    FREE_SLOT_SEARCH_MAX_DAYS: int = int(os.getenv("FREE_SLOT_SEARCH_MAX_DAYS", 31))
+    # Longest range /appointments/calendar answers, in days (hourly buckets: CALENDAR_MAX_HOURLY_DAYS)
+    CALENDAR_MAX_DAYS: int = int(os.getenv("CALENDAR_MAX_DAYS", 92))
+    CALENDAR_MAX_HOURLY_DAYS: int = int(os.getenv("CALENDAR_MAX_HOURLY_DAYS", 31))
+
+    # Reminder fan-out: appointments per subtask, sends in flight per subtask,
+    # sends per second across all workers, and how long a "sent" marker is kept
+    REMINDER_BATCH_SIZE: int = int(os.getenv("REMINDER_BATCH_SIZE", 200))
+    REMINDER_SEND_CONCURRENCY: int = int(os.getenv("REMINDER_SEND_CONCURRENCY", 8))
+    REMINDER_SEND_RATE_PER_SECOND: int = int(os.getenv("REMINDER_SEND_RATE_PER_SECOND", 20))
+    REMINDER_IDEMPOTENCY_TTL: int = int(os.getenv("REMINDER_IDEMPOTENCY_TTL", 3 * 24 * 3600))  # seconds
+    # Per-appointment timers: hours before the appointment, poll period and timers claimed per poll
+    REMINDER_OFFSETS_HOURS = [int(h) for h in os.getenv("REMINDER_OFFSETS_HOURS", "24,1").split(",") if h.strip()]
+    REMINDER_POLL_INTERVAL: int = int(os.getenv("REMINDER_POLL_INTERVAL", 30))  # seconds
+    REMINDER_DRAIN_BATCH: int = int(os.getenv("REMINDER_DRAIN_BATCH", 100))
+    # A claimed timer whose send failed is re-armed this far in the future
+    REMINDER_RETRY_DELAY: int = int(os.getenv("REMINDER_RETRY_DELAY", 300))  # seconds
+
+    REPORT_CACHE_TTL: int = int(os.getenv("REPORT_CACHE_TTL", 3600))  # seconds; entries are also versioned
+
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))  # rows per cursor fetch / response chunk
+
+    BULK_MAX_ITEMS: int = int(os.getenv("BULK_MAX_ITEMS", 500))  # items per batch create/status request
+
+    # Production server (gunicorn.conf.py; WEB_CONCURRENCY is with the DB pool settings):
+    # bind address, seconds a worker gets to finish in-flight requests on SIGTERM, and
+    # per-worker cache warm-up before serving
+    SERVER_BIND: str = os.getenv("SERVER_BIND", "0.0.0.0:8000")
+    GRACEFUL_TIMEOUT: int = int(os.getenv("GRACEFUL_TIMEOUT", 30))
+    WORKER_TIMEOUT: int = int(os.getenv("WORKER_TIMEOUT", 60))
+    WARMUP_ON_START: bool = os.getenv("WARMUP_ON_START", "true").lower() in ("1", "true", "yes")
+    WARMUP_DOCTOR_DAYS: int = int(os.getenv("WARMUP_DOCTOR_DAYS", 14))  # doctors booked this far ahead
+
+    # Local development only: remote debugger and uvicorn auto-reload for `python main.py`
+    DEBUGPY: bool = os.getenv("DEBUGPY", "false").lower() in ("1", "true", "yes")
+    DEBUGPY_PORT: int = int(os.getenv("DEBUGPY_PORT", 5680))
+    UVICORN_RELOAD: bool = os.getenv("UVICORN_RELOAD", "false").lower() in ("1", "true", "yes")
+
     API_PREFIX: str =os.getenv('API_PREFIX')
     BASE_URL = os.getenv("BASE_URL", "http://localhost:8000")
 config = Config()
\ No newline at end of file
@@ -1,8 +1,8 @@
 from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional, Any, List
+from typing import Optional, Any, Dict, List
 import re
 import enum
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 class UserType(str, enum.Enum):
     ADMIN = "admin"
@@ -35,11 +35,65 @@ class AppointmentResponse(BaseModel):
     appointment_date: datetime
     notes: Optional[str] = None
     doctor_name: Optional[str] = None 
+    patient_name: Optional[str] = None
     status: AppointmentStatus
     
     class Config:
         from_attributes = True
 
+class AppointmentUpdate(BaseModel):
+    doctor_id: Optional[int] = None
+    appointment_date: Optional[datetime] = None
+    notes: Optional[str] = None
+    status: Optional[AppointmentStatus] = None
+
+class AppointmentStatusUpdate(BaseModel):
+    status: AppointmentStatus
+
+class BulkAppointmentCreateItem(BaseModel):
+    # Validated per item by the bulk service, so one bad row doesn't reject the batch
+    doctor_id: int
+    patient_id: int
+    appointment_date: datetime
+    notes: Optional[str] = None
+    status: AppointmentStatus = AppointmentStatus.PENDING
+
+class BulkAppointmentCreate(BaseModel):
+    items: List[BulkAppointmentCreateItem]
+
+class BulkStatusUpdateItem(BaseModel):
+    appointment_id: int
+    status: AppointmentStatus
+
+class BulkStatusUpdate(BaseModel):
+    items: List[BulkStatusUpdateItem]
+
+class BulkItemResult(BaseModel):
+    index: int
+    success: bool
+    appointment_id: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+class FreeSlotsResponse(BaseModel):
+    doctor_id: int
+    slot_minutes: int
+    slots: List[datetime]
+
+class AppointmentCalendarResponse(BaseModel):
+    doctor_id: Optional[int] = None  # None: every doctor
+    start_date: date
+    end_date: date
+    granularity: str
+    timezone: str
+    # bucket ("2025-01-31" or "2025-01-31T09:00", local time) -> status -> count; empty buckets omitted
+    counts: Dict[str, Dict[AppointmentStatus, int]]
+    totals: Dict[AppointmentStatus, int]
+
 class SpecializationOut(BaseModel):
     id: int
     specialized: str
@@ -71,4 +125,11 @@ class DoctorReportBase(BaseModel):
     year: int
     total_patient_visits: int
     total_appointments: int
-    total_earnings: float
\ No newline at end of file
+    total_earnings: float
+
+class DoctorReportResponse(DoctorReportBase):
+    id: int
+    generated_at: Optional[date] = None
+
+    class Config:
+        from_attributes = True
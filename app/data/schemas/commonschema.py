@@ -7,7 +7,10 @@ from xml.etree import ElementTree
 from datetime import datetime
 from pydantic import BaseModel, field_validator
 from typing import List
-from app.utils.location_data import get_divisions, get_districts, get_upazilas
+from app.utils.location_data import (
+    get_divisions, get_districts, get_upazilas,
+    is_valid_division, is_valid_district, is_valid_upazila
+)
 
 
 T = TypeVar("T")
@@ -38,29 +41,28 @@ class LocationCreate(BaseModel):
     @field_validator('division')
     @classmethod
     def validate_division(cls, v: str) -> str:
-        divisions = get_divisions()
-        if v not in divisions:
-            raise ValueError(f"Invalid division. Must be one of: {', '.join(divisions)}")
+        if not is_valid_division(v):
+            raise ValueError(f"Invalid division. Must be one of: {', '.join(get_divisions())}")
         return v
 
     @field_validator('district')
     @classmethod
-    def validate_district(cls, v: str, values: dict) -> str:
-        if 'division' not in values:
+    def validate_district(cls, v: str, info: ValidationInfo) -> str:
+        if 'division' not in info.data:
             raise ValueError("Division must be provided first")
-        
-        districts = get_districts(values['division'])
-        if v not in districts:
-            raise ValueError(f"Invalid district for {values['division']}. Must be one of: {', '.join(districts)}")
+
+        division = info.data['division']
+        if not is_valid_district(division, v):
+            raise ValueError(f"Invalid district for {division}. Must be one of: {', '.join(get_districts(division))}")
         return v
 
     @field_validator('thana')
     @classmethod
-    def validate_thana(cls, v: str, values: dict) -> str:
-        if 'division' not in values or 'district' not in values:
+    def validate_thana(cls, v: str, info: ValidationInfo) -> str:
+        if 'division' not in info.data or 'district' not in info.data:
             raise ValueError("Division and district must be provided first")
-        
-        upazilas = get_upazilas(values['division'], values['district'])
-        if v not in upazilas:
-            raise ValueError(f"Invalid thana for {values['district']}. Must be one of: {', '.join(upazilas)}")
-        return v
\ No newline at end of file
+
+        division, district = info.data['division'], info.data['district']
+        if not is_valid_upazila(division, district, v):
+            raise ValueError(f"Invalid thana for {district}. Must be one of: {', '.join(get_upazilas(division, district))}")
+        return v
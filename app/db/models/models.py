@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Table, Column, Integer, Text, String, Boolean,Enum, DateTime, ForeignKey, JSON, func, TIMESTAMP, DECIMAL,Float,Date
+from sqlalchemy import Table, Column, Index, UniqueConstraint, text, Integer, Text, String, Boolean,Enum, DateTime, ForeignKey, JSON, func, TIMESTAMP, DECIMAL,Float,Date
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.schema import MetaData
@@ -30,6 +30,22 @@ class Appointment(Base):
     status = Column(SQLEnum(AppointmentStatus, name="appointment_status_enum"), default=AppointmentStatus.PENDING)
     created_at = Column(DateTime, server_default="now()")
 
+    # Mirrors alembic revision 9d4a1f6c2e80; the enum column stores member names
+    __table_args__ = (
+        Index("ix_appointments_doctor_id_appointment_date", "doctor_id", "appointment_date"),
+        Index("ix_appointments_patient_id_appointment_date", "patient_id", "appointment_date"),
+        Index("ix_appointments_status_appointment_date", "status", "appointment_date"),
+        Index(
+            "uq_appointments_doctor_slot", "doctor_id", "appointment_date",
+            unique=True,
+            postgresql_where=text("status <> 'CANCELLED'"),
+            sqlite_where=text("status <> 'CANCELLED'"),
+        ),
+    )
+
+# Violated when a doctor's slot is booked twice; see book_appointment
+UNIQUE_BOOKED_SLOT_CONSTRAINT = "uq_appointments_doctor_slot"
+
 
 
 # class PeriodicTaskModel(Base):
@@ -54,4 +70,9 @@ class DoctorReport(Base):
     total_patient_visits = Column(Integer, default=0)
     total_appointments = Column(Integer, default=0)
     total_earnings = Column(Float, default=0.0)
-    generated_at = Column(Date, server_default=func.now())
\ No newline at end of file
+    generated_at = Column(Date, server_default=func.now())
+
+    # One row per doctor per month; generate_monthly_report upserts on it
+    __table_args__ = (
+        UniqueConstraint("doctor_id", "year", "month", name="uq_doctor_reports_doctor_period"),
+    )
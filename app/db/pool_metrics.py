@@ -0,0 +1,80 @@
+import threading
+import time
+from typing import Dict, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from app.utils.metrics import Histogram
+
+
+class PoolMetrics:
+    """Counters for one engine's connection pool, fed by pool events and checkout timing."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkout_wait = Histogram()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool: Pool) -> Dict:
+        data = {
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "status": pool.status(),
+        }
+        # QueuePool-style pools; NullPool/StaticPool don't track these
+        for attr in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, attr):
+                data[attr] = getattr(pool, attr)()
+        return data
+
+
+class _InstrumentedPoolMixin:
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.incr("timeouts")
+            raise
+        finally:
+            self.metrics.checkout_wait.observe(time.perf_counter() - started)
+
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """Subclass of `base` that times every checkout wait and counts pool timeouts."""
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPoolMixin, base), {"metrics": metrics})
+
+
+def register_pool_events(engine: Engine, metrics: PoolMetrics) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.incr("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
@@ -0,0 +1,160 @@
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+# Bound parameter lists, e.g. "IN (%(id_1_1)s, %(id_1_2)s)" or "VALUES ($1, $2), ($3, $4)",
+# collapse to one placeholder so batches of different sizes share a shape
+_PARAM_LIST = re.compile(r"\(\s*(?:%\(\w+\)s|\$\d+|\?|:\w+)(?:\s*,\s*(?:%\(\w+\)s|\$\d+|\?|:\w+))*\s*\)")
+_VALUES_ROWS = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PARAM_LIST.sub("(?)", shape)
+    return _VALUES_ROWS.sub(r"\1", shape)
+
+
+def _short(statement: str, limit: int = 300) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+class QueryProfile:
+    """Statement count, DB time and per-shape repeats for one request or task."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.statements = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int):
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def report(self, threshold: int = None) -> None:
+        threshold = config.QUERY_N_PLUS_ONE_THRESHOLD if threshold is None else threshold
+        logger.info(
+            "%s: %d statements, %.1f ms in DB", self.name, self.statements, self.seconds * 1000
+        )
+        for shape, count in self.repeated(threshold):
+            logger.warning(
+                "Possible N+1 in %s: statement ran %d times: %s", self.name, count, _short(shape)
+            )
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+@contextmanager
+def profile_queries(name: str, sample_rate: float = 1.0):
+    """
+    Profile every statement run in this context (including threadpool copies of it).
+    Yields the QueryProfile, or None when this call isn't sampled.
+    """
+    if sample_rate < 1.0 and random.random() >= sample_rate:
+        yield None
+        return
+    profile = QueryProfile(name)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+        profile.report()
+
+
+def register_query_profiler(engine: Engine) -> None:
+    """Time each statement: feeds the active QueryProfile and the slow-query log."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(statement, elapsed)
+        if config.SLOW_QUERY_MS and elapsed * 1000 >= config.SLOW_QUERY_MS:
+            slow_query_logger.warning(
+                "Slow query (%.1f ms)%s: %s",
+                elapsed * 1000,
+                f" in {profile.name}" if profile is not None else "",
+                _short(statement),
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        # after_cursor_execute doesn't fire for failed statements; drop their start time
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+
+# Open profile_queries contexts of running Celery tasks, by task id
+_task_profiles: Dict[str, object] = {}
+
+
+def register_task_profiler(sample_rate: float = None) -> None:
+    """
+    Profile a sample of Celery task runs (QUERY_PROFILE_TASK_SAMPLE_RATE), named by task.
+    task_prerun and task_postrun fire on the thread that runs the task, so the
+    profile's ContextVar covers exactly the task body.
+    """
+    from celery.signals import task_postrun, task_prerun
+
+    sample_rate = config.QUERY_PROFILE_TASK_SAMPLE_RATE if sample_rate is None else sample_rate
+    if sample_rate <= 0:
+        return
+
+    @task_prerun.connect(weak=False)
+    def _start(task_id=None, task=None, **kwargs):
+        profiling = profile_queries(task.name, sample_rate)
+        profiling.__enter__()
+        _task_profiles[task_id] = profiling
+
+    @task_postrun.connect(weak=False)
+    def _finish(task_id=None, **kwargs):
+        profiling = _task_profiles.pop(task_id, None)
+        if profiling is not None:
+            profiling.__exit__(None, None, None)
+
+
+class QueryProfilerMiddleware:
+    """Profile a sample of HTTP requests (QUERY_PROFILE_SAMPLE_RATE), named by route template."""
+
+    def __init__(self, app, sample_rate: float = None):
+        self.app = app
+        self.sample_rate = config.QUERY_PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.sample_rate <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries(f"{scope['method']} {scope['path']}", self.sample_rate) as profile:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = scope.get("route")
+                if profile is not None and route is not None:
+                    profile.name = f"{scope['method']} {route.path}"
@@ -1,25 +1,106 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.config import config
+from app.db.pool_metrics import PoolMetrics, instrumented_pool_class, register_pool_events
+from app.db.query_profiler import register_query_profiler
+from app.db.statement_metrics import register_statement_counter
 
 SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
+SQLALCHEMY_ASYNC_DATABASE_URL = config.ASYNC_DATABASE_URL
 SQLALCHEMY_DATABASE_SCHEMA = config.POSTGRES_SCHEMA
 
-print("Database URL is ",SQLALCHEMY_DATABASE_URL)
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+POOL_OPTIONS = dict(
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_timeout=config.DB_POOL_TIMEOUT,
+    pool_recycle=config.DB_POOL_RECYCLE,
+    pool_pre_ping=config.DB_POOL_PRE_PING,
+)
+
+pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+# Engines are built on first use, so importing this module (every router, every
+# Celery task module) never touches the database. Schema and tables are created
+# by `alembic upgrade head`, not at import or startup.
+_engine = None
+_async_engine = None
+_engine_lock = threading.Lock()
+
+
+def _instrument(engine: Engine, metrics: PoolMetrics) -> None:
+    register_pool_events(engine, metrics)
+    register_statement_counter(engine)
+    register_query_profiler(engine)
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    SQLALCHEMY_DATABASE_URL,
+                    poolclass=instrumented_pool_class(QueuePool, pool_metrics),
+                    connect_args={"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"},
+                    **POOL_OPTIONS
+                )
+                _instrument(engine, pool_metrics)
+                _engine = engine
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    # Used by the async endpoints; Celery tasks and sync routes use get_engine()
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                engine = create_async_engine(
+                    SQLALCHEMY_ASYNC_DATABASE_URL,
+                    poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_metrics),
+                    connect_args={"server_settings": {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}},
+                    **POOL_OPTIONS
+                )
+                _instrument(engine.sync_engine, async_pool_metrics)
+                _async_engine = engine
+    return _async_engine
+
+
+def __getattr__(name):
+    # `from app.db.session import engine` keeps working; it just builds the engine then
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def create_schemas():
-    print("creating schema...")
-    with engine.connect() as connection:
-        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {SQLALCHEMY_DATABASE_SCHEMA}"))
-        connection.commit()
+class LazyBindSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.bind is None:
+            return get_engine()
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-create_schemas()
 
+class LazyAsyncBindSession(Session):
+    # The sync half of an AsyncSession binds to the async engine's sync facade
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.bind is None:
+            return get_async_engine().sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+SessionLocal = sessionmaker(class_=LazyBindSession, autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession, sync_session_class=LazyAsyncBindSession, autoflush=False, expire_on_commit=False
+)
 
 
 def get_db():
@@ -27,4 +108,38 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_engines() -> None:
+    """Shutdown hook: close pooled connections of whichever engines were created."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+def reset_engines_after_fork() -> None:
+    """
+    Called in each worker right after fork: drop pooled connections inherited from
+    the parent without closing them (the parent still owns the sockets). The child
+    then opens its own connections on first use.
+    """
+    if _engine is not None:
+        _engine.dispose(close=False)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+
+
+def get_pool_metrics():
+    metrics = {}
+    if _engine is not None:
+        metrics["sync"] = pool_metrics.snapshot(_engine.pool)
+    if _async_engine is not None:
+        metrics["async"] = async_pool_metrics.snapshot(_async_engine.sync_engine.pool)
+    return metrics
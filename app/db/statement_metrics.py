@@ -0,0 +1,11 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import record_call
+
+
+def register_statement_counter(engine: Engine) -> None:
+    """Count every statement against the current request (no-op outside one)."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        record_call("db")
@@ -1,8 +1,14 @@
+import hashlib
+import threading
+import time
+from typing import Optional
+
 import jwt
 from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 
 from app.config import config
+from app.utils.ttl_cache import TTLCache
 
 api_key_header = APIKeyHeader(name="X-API-Key",scheme_name="X-API-Key")
 oauth2_scheme = APIKeyHeader(name="Authorization")
@@ -35,10 +41,57 @@ async def get_current_user_id(token: str = Depends(oauth2_scheme)):
 
 
 
+# Keyed by SHA-256 of the token so raw bearer tokens aren't held in memory.
+# Only successfully verified payloads are stored; failures always re-run jwt.decode.
+_token_cache = TTLCache(maxsize=config.JWT_CACHE_MAXSIZE if config.JWT_CACHE_TTL > 0 else 0, ttl=config.JWT_CACHE_TTL)
+_decode_lock = threading.Lock()
+_decodes = 0
+_decode_seconds = 0.0
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _cached_payload(key: bytes) -> Optional[dict]:
+    payload = _token_cache.get(key)
+    if payload is None:
+        return None
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        # The entry's TTL is monotonic time; never trust it past the wall-clock exp
+        _token_cache.delete(key)
+        return None
+    return payload
+
+
+def _record_decode(seconds: float) -> None:
+    global _decodes, _decode_seconds
+    with _decode_lock:
+        _decodes += 1
+        _decode_seconds += seconds
+
+
+def get_token_cache_stats() -> dict:
+    stats = _token_cache.stats()
+    with _decode_lock:
+        decodes, seconds = _decodes, _decode_seconds
+    average = seconds / decodes if decodes else 0.0
+    stats["decodes"] = decodes
+    stats["avg_decode_ms"] = round(average * 1000, 4)
+    stats["estimated_seconds_saved"] = round(stats["hits"] * average, 4)
+    return stats
+
+
 def verify_token(token: str):
+    key = _token_key(token)
+    payload = _cached_payload(key)
+    if payload is not None:
+        return dict(payload)
+
+    started = time.perf_counter()
     try:
         payload = jwt.decode(token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,4 +101,11 @@ def verify_token(token: str):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
-        )
\ No newline at end of file
+        )
+    _record_decode(time.perf_counter() - started)
+
+    exp = payload.get("exp")
+    ttl = exp - time.time() if exp is not None else config.JWT_CACHE_TTL
+    _token_cache.set(key, payload, ttl=ttl)
+    # A copy, so a handler mutating its payload can't change what later requests see
+    return dict(payload)
\ No newline at end of file
@@ -1,9 +1,11 @@
-from .user_auth_router import user_auth_router
 from .appointment_router import appointment_router
 from .health_router import health_router
+from .report_router import report_router
+from .metrics_router import metrics_router
 
 
 __all__ = [
-    'user_auth_router',
     'appointment_router',
+    'report_router',
+    'metrics_router',
 ]
\ No newline at end of file
@@ -1,21 +1,33 @@
 # app/routers/appointments.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from datetime import datetime, timedelta
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+from app.db.session import get_db, get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies.auth import get_current_user, get_current_user_id
-from app.db.models.models import Appointment, AppointmentStatus, UserModel, DoctorSpecialization
+from app.db.models.models import Appointment, AppointmentStatus, UNIQUE_BOOKED_SLOT_CONSTRAINT
 from app.data.schemas.appointment.appointmentschema import (
     AppointmentCreate, AppointmentResponse, DoctorResponse,
-    AppointmentUpdate, AppointmentStatusUpdate,UserType
+    AppointmentUpdate, AppointmentStatusUpdate,UserType, FreeSlotsResponse,
+    BulkAppointmentCreate, BulkStatusUpdate, BulkResult, AppointmentCalendarResponse
     )
 from typing import Optional, List
 from app.config import config
 from datetime import datetime, timezone
 from sqlalchemy import func  # Add this import at the top of your file
-from pytz import timezone as pytz_timezone
+from sqlalchemy.exc import IntegrityError
 from app.services.appointment_service import update_appointment_by_admin, update_appointment_status_by_doctor
-from services.cache_user_service import get_user_info
+from app.services.cache_user_service import get_user_info, aget_user_info, get_user_lookup, UserLookup
+from app.utils.pagination import paginate_appointments
+from app.utils.json_response import orjson_response
+from app.services.availability_service import is_doctor_available, find_free_slots
+from app.utils.local_time import to_local, utc_naive
+from app.services.doctor_report_service import report_months, rollup_deltas, rollup_statement, rollup_state, doctor_fee
+from app.services.report_cache_service import abump_reports_version
+from app.services.export_service import apply_appointment_filters, EXPORT_MEDIA_TYPES, EXPORT_WRITERS
+from app.services.bulk_appointment_service import bulk_create_appointments, bulk_update_status
+from app.services.calendar_service import appointment_calendar
 
 appointment_router = APIRouter(
     prefix=f"{config.API_PREFIX}",
@@ -24,149 +36,252 @@ appointment_router = APIRouter(
 
 
 
-def is_doctor_available(doctor_id: int, appointment_date: datetime) -> bool:
-    # Convert to local timezone (Asia/Dhaka)
-    tz = pytz_timezone("Asia/Dhaka")
-    appointment_date_local = appointment_date.astimezone(tz)
-    appointment_time = appointment_date_local.time()
-
-    # ✅ Get doctor info from Redis
-    doctor = get_user_info(doctor_id)
-    if not doctor or doctor.get("user_type") != "doctor" or not doctor.get("available_timeslots"):
-        return False
-
-    available_slots = []
-    for slot in doctor["available_timeslots"].split(','):
-        try:
-            start_str, end_str = slot.split('-')
-            available_slots.append((start_str.strip(), end_str.strip()))
-        except ValueError:
-            continue
+# Only what AppointmentResponse needs; rows come back as tuples, not ORM objects
+APPOINTMENT_LIST_COLUMNS = (
+    Appointment.id,
+    Appointment.doctor_id,
+    Appointment.patient_id,
+    Appointment.appointment_date,
+    Appointment.notes,
+    Appointment.status,
+)
 
-    for start, end in available_slots:
-        try:
-            start_time = datetime.strptime(start, "%H:%M").time()
-            end_time = datetime.strptime(end, "%H:%M").time()
-            if start_time <= appointment_time <= end_time:
-                return True
-        except ValueError:
-            continue
 
-    return False
+def build_appointment_rows(rows, users: UserLookup) -> List[dict]:
+    """
+    AppointmentResponse-shaped dicts (same keys, same order) for a page of
+    APPOINTMENT_LIST_COLUMNS rows, ready for orjson_response.
+    """
+    # Resolve every doctor/patient on the page with one MGET instead of two GETs per row.
+    # Rows are read by position (doctor_id, patient_id are columns 1 and 2), which is
+    # several times cheaper than Row attribute access.
+    users.prefetch(user_id for row in rows for user_id in row[1:3])
+    full_name = users.full_name
+    return [
+        {
+            "id": appointment_id,
+            "doctor_id": doctor_id,
+            "patient_id": patient_id,
+            "appointment_date": appointment_date,
+            "notes": notes,
+            "doctor_name": full_name(doctor_id),
+            "patient_name": full_name(patient_id),
+            "status": appointment_status,
+        }
+        for appointment_id, doctor_id, patient_id, appointment_date, notes, appointment_status in rows
+    ]
 
 
 @appointment_router.post("/book_appointment", response_model=AppointmentResponse, status_code=status.HTTP_201_CREATED)
 async def book_appointment(
     appointment: AppointmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user_id: int = Depends(get_current_user_id)
 ):
-    current_time = datetime.now(timezone.utc)
-    if appointment.appointment_date.astimezone(timezone.utc) < current_time:
+    # appointment_date is a naive UTC column; asyncpg rejects aware values for it
+    appointment_date = utc_naive(appointment.appointment_date)
+    if appointment_date < datetime.now(timezone.utc).replace(tzinfo=None):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Appointment time must be in the future"
         )
 
-    doctor = get_user_info(appointment.doctor_id)
+    doctor = await aget_user_info(appointment.doctor_id)
     if not doctor or doctor.get("user_type") != "doctor":
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Doctor not found"
         )
 
-    if not is_doctor_available(db, appointment.doctor_id, appointment.appointment_date):
+    if not is_doctor_available(appointment.doctor_id, appointment_date, doctor=doctor):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Doctor is not available at this time"
         )
 
 
-    existing_appointment = db.query(Appointment).filter(
-        Appointment.doctor_id == appointment.doctor_id,
-        Appointment.appointment_date == appointment.appointment_date,
-        Appointment.status != AppointmentStatus.CANCELLED
-    ).first()
-
-    if existing_appointment:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Time slot already booked"
-        )
-
     # ✅ Create new appointment
     db_appointment = Appointment(
         doctor_id=appointment.doctor_id,
         patient_id=current_user_id,
-        appointment_date=appointment.appointment_date,
+        appointment_date=appointment_date,
         notes=appointment.notes,
         status=AppointmentStatus.PENDING.value
     )
 
+    # The partial unique index on (doctor_id, appointment_date) is the double-booking check
     db.add(db_appointment)
-    db.commit()
-    db.refresh(db_appointment)
+    deltas = rollup_deltas(None, rollup_state(db_appointment))
+    rollup = rollup_statement(deltas, {appointment.doctor_id: doctor_fee(doctor)})
+    if rollup is not None:
+        await db.execute(rollup)
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        if UNIQUE_BOOKED_SLOT_CONSTRAINT in str(exc.orig):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Time slot already booked"
+            )
+        raise
+    await db.refresh(db_appointment)
+    await abump_reports_version(report_months(deltas))
 
     return db_appointment
 
 
 
 
+@appointment_router.get("/doctors/{doctor_id}/free_slots", response_model=FreeSlotsResponse)
+def get_doctor_free_slots(
+    doctor_id: int,
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    Next free slots for a doctor between start_date (default: now) and end_date
+    (default: start_date + FREE_SLOT_SEARCH_MAX_DAYS). Naive datetimes are UTC, as when booking.
+    """
+    start_date = to_local(start_date or datetime.now(timezone.utc))
+    max_range = timedelta(days=config.FREE_SLOT_SEARCH_MAX_DAYS)
+    end_date = to_local(end_date) if end_date else start_date + max_range
+    if end_date <= start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be after start_date"
+        )
+    if end_date - start_date > max_range:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search range cannot exceed {config.FREE_SLOT_SEARCH_MAX_DAYS} days"
+        )
+
+    doctor = get_user_info(doctor_id)
+    if not doctor or doctor.get("user_type") != "doctor":
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Doctor not found"
+        )
+
+    slots = find_free_slots(
+        db,
+        doctor_id,
+        start_date,
+        end_date,
+        limit=limit,
+        slot_minutes=config.APPOINTMENT_SLOT_MINUTES,
+        doctor=doctor
+    )
+    return FreeSlotsResponse(doctor_id=doctor_id, slot_minutes=config.APPOINTMENT_SLOT_MINUTES, slots=slots)
+
+
 @appointment_router.get("/get_appointment_list", response_model=List[AppointmentResponse])
 def get_appointments(
     doctor_id: Optional[int] = Query(None),
-    status: Optional[AppointmentStatus] = Query(None),
+    status_filter: Optional[AppointmentStatus] = Query(None, alias="status"),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    response: Response = None,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    users: UserLookup = Depends(get_user_lookup),
+    current_user: dict = Depends(get_current_user)
 ):
         # Only allow admin users
     
-    if current_user.user_type != UserType.ADMIN.value:
+    if current_user.get("user_type") != UserType.ADMIN.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admin users can access this resource"
         )
     
-    query = db.query(Appointment)
     # Apply filters conditionally
-    if doctor_id is not None:
-        query = query.filter(Appointment.doctor_id == doctor_id)
-    if status is not None:
-        query = query.filter(Appointment.status == status)
-    if start_date is not None:
-        query = query.filter(Appointment.appointment_date >= start_date)
-    if end_date is not None:
-        query = query.filter(Appointment.appointment_date <= end_date)
+    query = apply_appointment_filters(db.query(*APPOINTMENT_LIST_COLUMNS), doctor_id, status_filter, start_date, end_date)
 
     # Apply pagination
-    appointments = query.order_by(Appointment.appointment_date).offset(skip).limit(limit).all()
-    response = []
-    for appointment in appointments:
-        doctor_data = get_user_info(appointment.doctor_id)
-        doctor_name = doctor_data["full_name"] if doctor_data else None
-        patient_data = get_user_info(appointment.patient_id)
-        patient_name = patient_data["full_name"] if patient_data else None
-
-        response.append(AppointmentResponse(
-            id=appointment.id,
-            appointment_date=appointment.appointment_date,
-            doctor_id=appointment.doctor_id,
-            doctor_name=doctor_name,
-            patient_id=appointment.patient_id,
-            patient_name=patient_name,
-            notes=appointment.notes,
-            status=appointment.status,
-        ))
-
-    return response
+    rows = paginate_appointments(query, skip, limit, cursor, response)
+    return orjson_response(build_appointment_rows(rows, users), response)
 
     # return appointments
 
 
+@appointment_router.get("/appointments/export")
+def export_appointments(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    doctor_id: Optional[int] = Query(None),
+    status_filter: Optional[AppointmentStatus] = Query(None, alias="status"),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Admin-only export of appointments as CSV or NDJSON, streamed from a
+    server-side cursor so memory stays flat regardless of the date range.
+    """
+    if current_user.get("user_type") != UserType.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can export appointments"
+        )
+
+    rows = EXPORT_WRITERS[export_format](
+        doctor_id=doctor_id,
+        status=status_filter,
+        start_date=start_date,
+        end_date=end_date
+    )
+    filename = f"appointments-{datetime.now(timezone.utc):%Y%m%d%H%M%S}.{export_format}"
+    return StreamingResponse(
+        rows,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@appointment_router.get("/appointments/calendar", response_model=AppointmentCalendarResponse)
+def get_appointment_calendar(
+    start_date: date = Query(..., description="First Asia/Dhaka day, inclusive"),
+    end_date: date = Query(..., description="Last Asia/Dhaka day, inclusive"),
+    granularity: str = Query("day", pattern="^(day|hour)$"),
+    doctor_id: Optional[int] = Query(None, description="Admins only; omit for every doctor"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Appointment counts per local day (or hour) and status, for calendar and
+    heatmap views. Doctors always get their own calendar; admins get one
+    doctor's or, without doctor_id, the whole clinic's.
+    """
+    user_type = current_user.get("user_type")
+    if user_type == UserType.DOCTOR.value:
+        doctor_id = current_user.get("user_id")
+    elif user_type != UserType.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only doctors and admin users can access this resource"
+        )
+
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must not be before start_date"
+        )
+    max_days = config.CALENDAR_MAX_HOURLY_DAYS if granularity == "hour" else config.CALENDAR_MAX_DAYS
+    if (end_date - start_date).days + 1 > max_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range cannot exceed {max_days} days for {granularity} granularity"
+        )
+
+    return appointment_calendar(db, start_date, end_date, granularity, doctor_id)
+
+
 @appointment_router.get("/get_appointment_list_by_user", response_model=List[AppointmentResponse])
 def get_appointments(
     doctor_id: Optional[int] = Query(None),
@@ -175,18 +290,21 @@ def get_appointments(
     end_date: Optional[datetime] = Query(None),
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    response: Response = None,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    users: UserLookup = Depends(get_user_lookup),
+    current_user: dict = Depends(get_current_user)
 ):
     # Only allow PATIENT users
-    if current_user.user_type != UserType.PATIENT:
+    if current_user.get("user_type") != UserType.PATIENT.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only Patient users can access this resource"
         )
 
     # Start query
-    query = db.query(Appointment).filter(Appointment.patient_id == current_user.id)
+    query = db.query(*APPOINTMENT_LIST_COLUMNS).filter(Appointment.patient_id == current_user.get("user_id"))
 
     if doctor_id:
         query = query.filter(Appointment.doctor_id == doctor_id)
@@ -198,16 +316,9 @@ def get_appointments(
         query = query.filter(Appointment.appointment_date <= end_date)
 
     # Apply ordering and pagination
-    appointments = (
-        query
-        .options(joinedload(Appointment.doctor))  # or `joinedload(Appointment.patient)` if needed
-        .order_by(Appointment.appointment_date)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
+    rows = paginate_appointments(query, skip, limit, cursor, response)
 
-    return appointments
+    return orjson_response(build_appointment_rows(rows, users), response)
 
 
 
@@ -217,13 +328,13 @@ def update_appointment(
     appointment_id: int,
     payload: AppointmentUpdate,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user)
 ):
     """
     Admin-only endpoint to update an appointment.
     """
     # ✅ Restrict access to Admins only
-    if current_user.user_type != UserType.ADMIN:
+    if current_user.get("user_type") != UserType.ADMIN.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admin users can update appointments."
@@ -241,6 +352,44 @@ def update_appointment(
     return updated_appointment
 
 
+def require_admin_batch(current_user: dict, count: int) -> None:
+    if current_user.get("user_type") != UserType.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can run batch operations"
+        )
+    if count > config.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {config.BULK_MAX_ITEMS} items"
+        )
+
+
+@appointment_router.post("/appointments/batch", response_model=BulkResult)
+def batch_create_appointments(
+    payload: BulkAppointmentCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Admin-only: create many appointments in one transaction.
+    Each item succeeds or fails on its own; see `results` for per-item errors.
+    """
+    require_admin_batch(current_user, len(payload.items))
+    return bulk_create_appointments(db, payload.items)
+
+
+@appointment_router.put("/appointments/batch/status", response_model=BulkResult)
+def batch_update_appointment_status(
+    payload: BulkStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Admin-only: change the status of many appointments in one transaction."""
+    require_admin_batch(current_user, len(payload.items))
+    return bulk_update_status(db, payload.items)
+
+
 @appointment_router.get("/doctor/appointments", response_model=List[AppointmentResponse])
 def get_doctor_appointments(
     status_filter: Optional[AppointmentStatus] = Query(None),
@@ -248,20 +397,23 @@ def get_doctor_appointments(
     end_date: Optional[datetime] = Query(None),
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces skip"),
+    response: Response = None,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    users: UserLookup = Depends(get_user_lookup),
+    current_user: dict = Depends(get_current_user)
 ):
     """
     Fetch appointments for the currently logged-in doctor,
     optionally filtered by status, start_date, and end_date.
     """
-    if current_user.user_type != UserType.DOCTOR:
+    if current_user.get("user_type") != UserType.DOCTOR.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only doctors can access this endpoint."
         )
 
-    query = db.query(Appointment).filter(Appointment.doctor_id == current_user.id)
+    query = db.query(*APPOINTMENT_LIST_COLUMNS).filter(Appointment.doctor_id == current_user.get("user_id"))
 
     if status_filter:
         query = query.filter(Appointment.status == status_filter)
@@ -270,14 +422,9 @@ def get_doctor_appointments(
     if end_date:
         query = query.filter(Appointment.appointment_date <= end_date)
 
-    appointments = (
-        query.order_by(Appointment.appointment_date)
-             .offset(skip)
-             .limit(limit)
-             .all()
-    )
+    rows = paginate_appointments(query, skip, limit, cursor, response)
 
-    return appointments
+    return orjson_response(build_appointment_rows(rows, users), response)
 
 
 
@@ -286,9 +433,9 @@ def doctor_update_appointment_status(
     appointment_id: int,
     payload: AppointmentStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user)
 ):
-    if current_user.user_type != UserType.DOCTOR:
+    if current_user.get("user_type") != UserType.DOCTOR.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only doctors can update appointment status"
@@ -296,7 +443,7 @@ def doctor_update_appointment_status(
 
     return update_appointment_status_by_doctor(
         db=db,
-        doctor_id=current_user.id,
+        doctor_id=current_user.get("user_id"),
         appointment_id=appointment_id,
         new_status=payload.status
     )
\ No newline at end of file
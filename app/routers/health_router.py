@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.config import config
-from app.dependencies.auth import get_current_user_id
+from app.dependencies.auth import get_current_user_id, get_token_cache_stats
+from app.services.cache_user_service import get_user_cache_stats
+from app.db.session import get_pool_metrics
 
 health_router = APIRouter(
     prefix=f'{config.API_PREFIX}/health',
@@ -15,4 +17,13 @@ async def health_check():
 
 @health_router.get('/auth', status_code=status.HTTP_200_OK)
 async def health_check_auth(user_id: int = Depends(get_current_user_id)):
-    return{"message": "You are authenticated", "user": user_id}
\ No newline at end of file
+    return{"message": "You are authenticated", "user": user_id}
+
+@health_router.get('/cache', status_code=status.HTTP_200_OK)
+async def health_check_cache(user_id: int = Depends(get_current_user_id)):
+    return {"user_cache": get_user_cache_stats(), "token_cache": get_token_cache_stats()}
+
+
+@health_router.get('/db', status_code=status.HTTP_200_OK)
+async def health_check_db_pool(user_id: int = Depends(get_current_user_id)):
+    return {"pools": get_pool_metrics()}
@@ -20,35 +20,23 @@ async def get_all_divisions():
 
 @location_router.get("/districts/{division}", response_model=DistrictResponse)
 async def get_districts_by_division(division: str):
-    try:
-        districts = get_districts(division)
-        if not districts:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No districts found for division: {division}"
-            )
-        return {"districts": districts}
-    except Exception as e:
+    districts = get_districts(division)
+    if not districts:
         raise HTTPException(
-            status_code=400,
-            detail=str(e)
+            status_code=404,
+            detail=f"No districts found for division: {division}"
         )
+    return {"districts": districts}
 
 @location_router.get("/upazilas/{division}/{district}", response_model=UpazilaResponse)
 async def get_upazilas_by_district(division: str, district: str):
-    try:
-        upazilas = get_upazilas(division, district)
-        if not upazilas:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No upazilas found for {district}, {division}"
-            )
-        return {"upazilas": upazilas}
-    except Exception as e:
+    upazilas = get_upazilas(division, district)
+    if not upazilas:
         raise HTTPException(
-            status_code=400,
-            detail=str(e)
+            status_code=404,
+            detail=f"No upazilas found for {district}, {division}"
         )
+    return {"upazilas": upazilas}
 
 class UserType(str, enum.Enum):
     ADMIN = "admin"
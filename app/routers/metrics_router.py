@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.utils.request_metrics import request_metrics
+
+# Unprefixed, where Prometheus scrapes by default
+metrics_router = APIRouter(tags=['Metrics'])
+
+
+@metrics_router.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(
+        request_metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
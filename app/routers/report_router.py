@@ -1,54 +1,96 @@
 # app/routers/reports.py
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import date
 from typing import Optional
-from ..core.database import get_db
-from ..models.report import DoctorReport
-from ..schemas.report import DoctorReport as DoctorReportSchema
+from app.config import config
+from app.db.session import get_db
+from app.db.models.models import DoctorReport
+from app.data.schemas.appointment.appointmentschema import DoctorReportResponse, UserType
+from app.dependencies.auth import get_current_user
+from app.services.report_cache_service import get_or_build
 
-router = APIRouter(prefix="/reports", tags=["Reports"])
+report_router = APIRouter(prefix=f"{config.API_PREFIX}/reports", tags=["Reports"])
 
-@router.get("/monthly", response_model=list[DoctorReportSchema])
+
+def cached_json_response(body: Optional[str], etag: str) -> Response:
+    # Clients must revalidate, which is a cheap 304 while the reports version is unchanged
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if body is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@report_router.get("/monthly", response_model=list[DoctorReportResponse])
 def get_monthly_reports(
     year: Optional[int] = None,
     month: Optional[int] = None,
     doctor_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
 ):
-    """Get monthly reports with optional filters"""
-    query = db.query(DoctorReport)
-    
-    if year:
-        query = query.filter(DoctorReport.year == year)
-    if month:
-        query = query.filter(DoctorReport.month == month)
-    if doctor_id:
-        query = query.filter(DoctorReport.doctor_id == doctor_id)
-    
-    return query.order_by(DoctorReport.year.desc(), DoctorReport.month.desc()).all()
-
-@router.get("/monthly/summary")
+    """Get monthly reports with optional filters. Doctors only see their own rows."""
+    user_type = current_user.get("user_type")
+    if user_type == UserType.DOCTOR.value:
+        doctor_id = current_user.get("user_id")
+    elif user_type != UserType.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only doctors and admin users can access this resource"
+        )
+
+    def build() -> str:
+        query = db.query(DoctorReport)
+
+        if year:
+            query = query.filter(DoctorReport.year == year)
+        if month:
+            query = query.filter(DoctorReport.month == month)
+        if doctor_id:
+            query = query.filter(DoctorReport.doctor_id == doctor_id)
+
+        reports = query.order_by(DoctorReport.year.desc(), DoctorReport.month.desc()).all()
+        return json.dumps([DoctorReportResponse.model_validate(r).model_dump(mode="json") for r in reports])
+
+    body, etag = get_or_build("monthly", (year, month, doctor_id), build, if_none_match, year=year, month=month)
+    return cached_json_response(body, etag)
+
+@report_router.get("/monthly/summary")
 def get_monthly_summary(
     year: Optional[int] = None,
     month: Optional[int] = None,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
 ):
-    """Get summary of all monthly reports"""
-    query = db.query(
-        func.sum(DoctorReport.total_patient_visits).label("total_patients"),
-        func.sum(DoctorReport.total_appointments).label("total_appointments"),
-        func.sum(DoctorReport.total_earnings).label("total_earnings")
-    )
-    
-    if year:
-        query = query.filter(DoctorReport.year == year)
-    if month:
-        query = query.filter(DoctorReport.month == month)
-    
-    result = query.first()
-    return {
-        "total_patients": result[0] or 0,
-        "total_appointments": result[1] or 0,
-        "total_earnings": result[2] or 0
-    }
\ No newline at end of file
+    """Get summary of all monthly reports (clinic-wide, admins only)"""
+    if current_user.get("user_type") != UserType.ADMIN.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can access this resource"
+        )
+
+    def build() -> str:
+        query = db.query(
+            func.sum(DoctorReport.total_patient_visits).label("total_patients"),
+            func.sum(DoctorReport.total_appointments).label("total_appointments"),
+            func.sum(DoctorReport.total_earnings).label("total_earnings")
+        )
+
+        if year:
+            query = query.filter(DoctorReport.year == year)
+        if month:
+            query = query.filter(DoctorReport.month == month)
+
+        result = query.first()
+        return json.dumps({
+            "total_patients": result[0] or 0,
+            "total_appointments": result[1] or 0,
+            "total_earnings": result[2] or 0
+        })
+
+    body, etag = get_or_build("summary", (year, month), build, if_none_match, year=year, month=month)
+    return cached_json_response(body, etag)
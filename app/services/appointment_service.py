@@ -2,7 +2,10 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.db.models.models import Appointment
 from app.data.schemas.appointment.appointmentschema import AppointmentUpdate, AppointmentStatus
-from services.cache_user_service import get_user_info
+from app.utils.local_time import utc_naive
+from app.services.doctor_report_service import apply_rollup, rollup_state
+from app.services.reminder_timer_service import sync_reminders
+from app.services.report_cache_service import bump_reports_version
 
 def update_appointment_by_admin(
     db: Session,
@@ -19,12 +22,20 @@ def update_appointment_by_admin(
         )
 
     data = update_data.dict(exclude_unset=True)
+    if data.get("appointment_date") is not None:
+        data["appointment_date"] = utc_naive(data["appointment_date"])
 
+    before = rollup_state(appointment)
     for field, value in data.items():
         setattr(appointment, field, value)
 
+    # Keep the month's DoctorReport counters in step, in the same transaction
+    changed_months = apply_rollup(db, before, rollup_state(appointment))
     db.commit()
     db.refresh(appointment)
+    bump_reports_version(changed_months)
+    # Arm, move or drop the reminder timers once the change is committed
+    sync_reminders(appointment)
     return appointment
 
 def update_appointment_status_by_doctor(
@@ -41,7 +52,12 @@ def update_appointment_status_by_doctor(
     if not appointment:
         raise HTTPException(status_code=404, detail="Appointment not found or unauthorized")
 
+    before = rollup_state(appointment)
     appointment.status = new_status
+    changed_months = apply_rollup(db, before, rollup_state(appointment))
     db.commit()
     db.refresh(appointment)
+    bump_reports_version(changed_months)
+    # Arm, move or drop the reminder timers once the change is committed
+    sync_reminders(appointment)
     return appointment
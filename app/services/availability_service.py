@@ -0,0 +1,155 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.models.models import Appointment, AppointmentStatus
+from app.services.cache_user_service import get_user_info
+from app.utils.local_time import LOCAL_TZ, to_local, utc_naive
+
+
+def _parse_minute_of_day(value: str) -> int:
+    hours, minutes = value.strip().split(":")
+    hours, minutes = int(hours), int(minutes)
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Invalid time: {value}")
+    return hours * 60 + minutes
+
+
+class CompiledAvailability:
+    """
+    A doctor's `available_timeslots` string ("09:00-12:00,14:00-17:00") compiled
+    into sorted, merged [start, end] minute-of-day intervals searched with bisect.
+    Both ends are inclusive, matching the original per-call strptime check.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, intervals: List[Tuple[int, int]]):
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        self.starts = [start for start, _ in merged]
+        self.ends = [end for _, end in merged]
+
+    @property
+    def intervals(self) -> List[Tuple[int, int]]:
+        return list(zip(self.starts, self.ends))
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def contains_minute(self, minute: int) -> bool:
+        i = bisect_right(self.starts, minute) - 1
+        return i >= 0 and minute <= self.ends[i]
+
+    def contains_time(self, value: time) -> bool:
+        minute = value.hour * 60 + value.minute
+        if value.second or value.microsecond:
+            # 12:00:30 is past a 12:00 end, but still inside a 11:00-12:01 slot
+            i = bisect_right(self.starts, minute) - 1
+            return i >= 0 and minute < self.ends[i]
+        return self.contains_minute(minute)
+
+
+@lru_cache(maxsize=4096)
+def compile_timeslots(timeslots: str) -> CompiledAvailability:
+    """
+    Compile a timeslot string once; the cache is keyed on the string itself, so a
+    doctor's entry is rebuilt only when their profile's timeslots change.
+    Malformed slots are skipped, as before.
+    """
+    intervals = []
+    for slot in timeslots.split(","):
+        try:
+            start_str, end_str = slot.split("-")
+            start, end = _parse_minute_of_day(start_str), _parse_minute_of_day(end_str)
+        except ValueError:
+            continue
+        if start <= end:
+            intervals.append((start, end))
+    return CompiledAvailability(intervals)
+
+
+def get_doctor_availability(doctor_id: int, doctor: Optional[dict] = None) -> Optional[CompiledAvailability]:
+    """Compiled availability for a doctor, or None if they are not a bookable doctor."""
+    if doctor is None:
+        doctor = get_user_info(doctor_id)
+    if not doctor or doctor.get("user_type") != "doctor" or not doctor.get("available_timeslots"):
+        return None
+    return compile_timeslots(doctor["available_timeslots"])
+
+
+def is_doctor_available(doctor_id: int, appointment_date: datetime, doctor: Optional[dict] = None) -> bool:
+    availability = get_doctor_availability(doctor_id, doctor)
+    if not availability:
+        return False
+    return availability.contains_time(to_local(appointment_date).time())
+
+
+def get_booked_times(db: Session, doctor_id: int, start: datetime, end: datetime) -> List[datetime]:
+    """Sorted start times of the doctor's non-cancelled appointments in [start, end), one range query."""
+    rows = db.query(Appointment.appointment_date).filter(
+        Appointment.doctor_id == doctor_id,
+        Appointment.appointment_date >= utc_naive(start),
+        Appointment.appointment_date < utc_naive(end),
+        Appointment.status != AppointmentStatus.CANCELLED
+    ).order_by(Appointment.appointment_date).all()
+    return [utc_naive(row.appointment_date) for row in rows]
+
+
+def iter_candidate_slots(availability: CompiledAvailability, start: datetime, end: datetime, slot_minutes: int):
+    """Yield aware local slot starts, between start and end, of slots that fit inside the doctor's hours."""
+    day = start.date()
+    while day <= end.date():
+        midnight = LOCAL_TZ.localize(datetime.combine(day, time.min))
+        for first, last in availability.intervals:
+            # The whole slot must end by `last`: 09:00-09:45 holds one 30-minute slot, not two
+            for minute in range(first, last - slot_minutes + 1, slot_minutes):
+                slot = LOCAL_TZ.normalize(midnight + timedelta(minutes=minute))
+                if slot < start:
+                    continue
+                if slot >= end:
+                    return
+                yield slot
+        day += timedelta(days=1)
+
+
+def find_free_slots(
+    db: Session,
+    doctor_id: int,
+    start: datetime,
+    end: datetime,
+    limit: int,
+    slot_minutes: int,
+    doctor: Optional[dict] = None
+) -> List[datetime]:
+    """
+    Next `limit` free slots for a doctor: the compiled availability intersected with the
+    doctor's booked appointments, fetched once for the whole range.
+    A slot is taken if any non-cancelled appointment starts inside it; past slots are skipped.
+    """
+    availability = get_doctor_availability(doctor_id, doctor)
+    if not availability:
+        return []
+
+    start, end = max(to_local(start), datetime.now(LOCAL_TZ)), to_local(end)
+    if start >= end:
+        return []
+    booked = get_booked_times(db, doctor_id, start, end)
+
+    free = []
+    for slot in iter_candidate_slots(availability, start, end, slot_minutes):
+        slot_start = utc_naive(slot)
+        i = bisect_left(booked, slot_start)
+        if i < len(booked) and booked[i] < slot_start + timedelta(minutes=slot_minutes):
+            continue
+        free.append(slot)
+        if len(free) >= limit:
+            break
+    return free
@@ -0,0 +1,159 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, literal, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.data.schemas.appointment.appointmentschema import (
+    BulkAppointmentCreateItem, BulkStatusUpdateItem, BulkItemResult, BulkResult
+)
+from app.db.models.models import Appointment, AppointmentStatus
+from app.services.availability_service import is_doctor_available
+from app.services.cache_user_service import get_users_info
+from app.services.doctor_report_service import apply_rollups
+from app.services.reminder_timer_service import sync_reminders_many
+from app.services.report_cache_service import bump_reports_version
+from app.utils.local_time import utc_naive
+
+
+def _result(results: Dict[int, BulkItemResult]) -> BulkResult:
+    ordered = [results[i] for i in sorted(results)]
+    succeeded = sum(1 for r in ordered if r.success)
+    return BulkResult(succeeded=succeeded, failed=len(ordered) - succeeded, results=ordered)
+
+
+def bulk_create_appointments(db: Session, items: List[BulkAppointmentCreateItem]) -> BulkResult:
+    """
+    Validate every item in one pass (one MGET for doctors, one query for taken slots),
+    then write the valid ones with a single multi-row INSERT in one transaction.
+    Slots taken concurrently are caught by ON CONFLICT on the unique-slot index.
+    """
+    results: Dict[int, BulkItemResult] = {}
+    now = datetime.now(timezone.utc)
+    doctors = get_users_info(item.doctor_id for item in items)
+
+    candidates: List[Tuple[int, BulkAppointmentCreateItem, Tuple[int, datetime]]] = []
+    seen = set()
+    for index, item in enumerate(items):
+        slot = (item.doctor_id, utc_naive(item.appointment_date))
+        doctor = doctors.get(item.doctor_id)
+        error: Optional[str] = None
+        if slot[1] < now.replace(tzinfo=None):
+            error = "Appointment time must be in the future"
+        elif not doctor or doctor.get("user_type") != "doctor":
+            error = "Doctor not found"
+        elif not is_doctor_available(item.doctor_id, item.appointment_date, doctor=doctor):
+            error = "Doctor is not available at this time"
+        elif slot in seen:
+            error = "Time slot duplicated in this batch"
+        if error:
+            results[index] = BulkItemResult(index=index, success=False, error=error)
+            continue
+        seen.add(slot)
+        candidates.append((index, item, slot))
+
+    if candidates:
+        taken = set(
+            db.query(Appointment.doctor_id, Appointment.appointment_date).filter(
+                tuple_(Appointment.doctor_id, Appointment.appointment_date).in_([slot for _, _, slot in candidates]),
+                Appointment.status != AppointmentStatus.CANCELLED
+            ).all()
+        )
+        remaining = []
+        for index, item, slot in candidates:
+            if slot in taken:
+                results[index] = BulkItemResult(index=index, success=False, error="Time slot already booked")
+            else:
+                remaining.append((index, item, slot))
+        candidates = remaining
+
+    created: List[Appointment] = []
+    if candidates:
+        rows = [
+            {
+                "doctor_id": item.doctor_id,
+                "patient_id": item.patient_id,
+                "appointment_date": slot[1],
+                "notes": item.notes,
+                "status": AppointmentStatus(item.status.value),
+            }
+            for _, item, slot in candidates
+        ]
+        stmt = insert(Appointment).values(rows).on_conflict_do_nothing(
+            index_elements=[Appointment.doctor_id, Appointment.appointment_date],
+            index_where=Appointment.status != AppointmentStatus.CANCELLED,
+        ).returning(Appointment.id, Appointment.doctor_id, Appointment.appointment_date, Appointment.status)
+        inserted = {(row.doctor_id, row.appointment_date): row for row in db.execute(stmt)}
+
+        for index, item, slot in candidates:
+            row = inserted.get(slot)
+            if row is None:
+                results[index] = BulkItemResult(index=index, success=False, error="Time slot already booked")
+                continue
+            results[index] = BulkItemResult(index=index, success=True, appointment_id=row.id)
+            created.append(Appointment(
+                id=row.id, doctor_id=row.doctor_id, appointment_date=row.appointment_date, status=row.status
+            ))
+
+    changed_months = apply_rollups(
+        db, [(None, (a.doctor_id, a.appointment_date, a.status)) for a in created]
+    )
+    db.commit()
+
+    bump_reports_version(changed_months)
+    sync_reminders_many(created)
+    return _result(results)
+
+
+def bulk_update_status(db: Session, items: List[BulkStatusUpdateItem]) -> BulkResult:
+    """
+    Apply many status changes with one SELECT, one UPDATE .. CASE and one rollup upsert,
+    all in a single transaction. Later items for the same appointment win.
+    """
+    results: Dict[int, BulkItemResult] = {}
+    new_status: Dict[int, AppointmentStatus] = {}
+    index_of: Dict[int, List[int]] = {}
+    for index, item in enumerate(items):
+        new_status[item.appointment_id] = AppointmentStatus(item.status.value)
+        index_of.setdefault(item.appointment_id, []).append(index)
+
+    appointments = db.query(Appointment).filter(Appointment.id.in_(list(new_status))).all() if new_status else []
+    found = {a.id: a for a in appointments}
+
+    for appointment_id, indexes in index_of.items():
+        for index in indexes:
+            if appointment_id in found:
+                results[index] = BulkItemResult(index=index, success=True, appointment_id=appointment_id)
+            else:
+                results[index] = BulkItemResult(
+                    index=index, success=False, appointment_id=appointment_id, error="Appointment not found"
+                )
+
+    changed = [a for a in appointments if a.status != new_status[a.id]]
+    if changed:
+        changes = [
+            ((a.doctor_id, a.appointment_date, a.status), (a.doctor_id, a.appointment_date, new_status[a.id]))
+            for a in changed
+        ]
+        db.execute(
+            update(Appointment)
+            .where(Appointment.id.in_([a.id for a in changed]))
+            .values(status=case(
+                {a.id: literal(new_status[a.id], Appointment.status.type) for a in changed},
+                value=Appointment.id
+            ))
+            .execution_options(synchronize_session=False)
+        )
+        changed_months = apply_rollups(db, changes)
+    else:
+        changed_months = set()
+    # Detached snapshots: reading the session's objects after commit would reload each one
+    updated = [
+        Appointment(id=a.id, appointment_date=a.appointment_date, status=new_status[a.id]) for a in changed
+    ]
+    db.commit()
+
+    bump_reports_version(changed_months)
+    sync_reminders_many(updated)
+    return _result(results)
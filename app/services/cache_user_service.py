@@ -1,9 +1,223 @@
 import json
-from utils.redis_client import redis_client
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+import redis
+from app.config import config
+from app.utils.redis_client import redis_client, async_redis_client
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# L1: per-process, bounded, short-lived. L2: the shared Redis `user:{id}` records,
+# written by the user service. L1 entries are dropped on Redis keyspace events for
+# user:* (so no writer has to publish anything); USER_CACHE_L1_TTL bounds staleness
+# whenever those events or Redis itself are unavailable.
+_user_l1 = TTLCache(maxsize=config.USER_CACHE_L1_MAXSIZE, ttl=config.USER_CACHE_L1_TTL)
+
+# notify-keyspace-events flags the listener relies on: K keyspace channel,
+# $ string writes (SET ...), g generic (DEL, EXPIRE, RENAME ...), x expiry
+KEYSPACE_EVENT_FLAGS = "K$gx"
+
+# Reconnect delay of the invalidation listener, doubling per failure up to the max (seconds)
+LISTENER_BACKOFF_MIN = 1.0
+LISTENER_BACKOFF_MAX = 30.0
+
+_listener_lock = threading.Lock()
+_listener_thread: Optional[threading.Thread] = None
+_listener_stop = threading.Event()
+_listener_subscribed = False
+_keyspace_events = False
+
+
+def _user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
 
 def get_user_info(user_id: int):
-    key = f"user:{user_id}"
+    user = _user_l1.get(user_id)
+    if user is not None:
+        return user
+
+    key = _user_key(user_id)
     user_data = redis_client.get(key)
     if user_data:
-        return json.loads(user_data)
+        user = json.loads(user_data)
+        _user_l1.set(user_id, user)
+        return user
+    return None
+
+
+async def aget_user_info(user_id: int):
+    """Async twin of get_user_info for use inside async endpoints."""
+    user = _user_l1.get(user_id)
+    if user is not None:
+        return user
+
+    user_data = await async_redis_client.get(_user_key(user_id))
+    if user_data:
+        user = json.loads(user_data)
+        _user_l1.set(user_id, user)
+        return user
     return None
+
+
+def get_users_info(user_ids: Iterable[int]) -> Dict[int, Optional[dict]]:
+    """
+    Fetch several cached users, serving what we can from L1 and the rest with a single MGET.
+    Duplicate ids are collapsed, so each user is fetched and decoded once.
+    Ids with no cached record map to None.
+    """
+    unique_ids = list(dict.fromkeys(uid for uid in user_ids if uid is not None))
+    users: Dict[int, Optional[dict]] = {}
+    missing = []
+    for uid in unique_ids:
+        user = _user_l1.get(uid)
+        if user is None:
+            missing.append(uid)
+        else:
+            users[uid] = user
+    if not missing:
+        return users
+
+    raw_values = redis_client.mget([_user_key(uid) for uid in missing])
+    for uid, raw in zip(missing, raw_values):
+        user = json.loads(raw) if raw else None
+        if user is not None:
+            _user_l1.set(uid, user)
+        users[uid] = user
+    return users
+
+
+def _user_keyspace_pattern() -> str:
+    db = redis_client.connection_pool.connection_kwargs.get("db", 0)
+    return f"__keyspace@{db}__:{_user_key('*')}"
+
+
+def _ensure_keyspace_events() -> bool:
+    """
+    Check that Redis publishes keyspace events for user:* writes and, only if
+    USER_CACHE_CONFIGURE_KEYSPACE_EVENTS is set, add the missing flags. Returns False
+    when they are off or Redis can't be asked (e.g. CONFIG is disabled on managed
+    Redis, or Redis is down); L1 then relies on its TTL alone.
+    """
+    try:
+        current = redis_client.config_get("notify-keyspace-events").get("notify-keyspace-events", "")
+        # "A" is the alias for every event class, including $, g and x
+        enabled = current.replace("A", "$glshzxet")
+        missing = "".join(flag for flag in KEYSPACE_EVENT_FLAGS if flag not in enabled)
+        if missing and config.USER_CACHE_CONFIGURE_KEYSPACE_EVENTS:
+            redis_client.config_set("notify-keyspace-events", current + missing)
+            missing = ""
+    except redis.RedisError as exc:
+        reason = str(exc)
+    else:
+        if not missing:
+            return True
+        reason = f"notify-keyspace-events lacks {missing!r}"
+    logger.warning(
+        "Redis keyspace events unavailable (%s); user L1 entries expire after %ss instead",
+        reason, config.USER_CACHE_L1_TTL
+    )
+    return False
+
+
+def _handle_user_key_event(message) -> None:
+    # channel is __keyspace@<db>__:user:<id>; any event on the key makes our copy stale
+    user_id = message.get("channel", "").rsplit(":", 1)[-1]
+    try:
+        _user_l1.delete(int(user_id))
+    except ValueError:
+        logger.warning("Ignoring keyspace event for unexpected key: %r", message.get("channel"))
+
+
+def _listen(stop: threading.Event) -> None:
+    """Listener thread: subscribe, dispatch events, and reconnect with backoff until stopped."""
+    global _listener_subscribed, _keyspace_events
+    backoff = LISTENER_BACKOFF_MIN
+    while not stop.is_set():
+        pubsub = None
+        try:
+            _keyspace_events = _ensure_keyspace_events()
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.psubscribe(**{_user_keyspace_pattern(): _handle_user_key_event})
+            _listener_subscribed = True
+            backoff = LISTENER_BACKOFF_MIN
+            while not stop.is_set():
+                # Subscribed handlers run inside get_message
+                pubsub.get_message(timeout=1.0)
+        except redis.RedisError as exc:
+            logger.warning("User cache invalidation listener error: %s; retrying in %ss", exc, backoff)
+        finally:
+            _listener_subscribed = False
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except redis.RedisError:
+                    pass
+        # Events may have been missed while disconnected; start from a clean L1
+        _user_l1.clear()
+        stop.wait(backoff)
+        backoff = min(backoff * 2, LISTENER_BACKOFF_MAX)
+
+
+def start_user_cache_listener() -> None:
+    """
+    Drop L1 entries whenever their user:{id} key changes in Redis (idempotent).
+    Never touches Redis on the caller's thread, so an unreachable Redis can't block startup.
+    """
+    global _listener_thread
+    with _listener_lock:
+        if _listener_thread is not None and _listener_thread.is_alive():
+            return
+        _listener_stop.clear()
+        _listener_thread = threading.Thread(
+            target=_listen, args=(_listener_stop,), name="user-cache-listener", daemon=True
+        )
+        _listener_thread.start()
+
+
+def stop_user_cache_listener() -> None:
+    global _listener_thread
+    with _listener_lock:
+        if _listener_thread is not None:
+            _listener_stop.set()
+            _listener_thread.join(timeout=5)
+            _listener_thread = None
+
+
+def get_user_cache_stats() -> dict:
+    stats = _user_l1.stats()
+    stats["invalidation_listener"] = _listener_subscribed
+    stats["keyspace_events"] = _keyspace_events
+    return stats
+
+
+class UserLookup:
+    """
+    Request-scoped view over the user cache.
+    Call prefetch() with every id a page needs, then get() is a dict lookup;
+    ids missed by prefetch are fetched on demand and memoized.
+    """
+
+    def __init__(self):
+        self._users: Dict[int, Optional[dict]] = {}
+
+    def prefetch(self, user_ids: Iterable[int]) -> None:
+        missing = [uid for uid in user_ids if uid not in self._users]
+        if missing:
+            self._users.update(get_users_info(missing))
+
+    def get(self, user_id: int) -> Optional[dict]:
+        if user_id not in self._users:
+            self.prefetch([user_id])
+        return self._users.get(user_id)
+
+    def full_name(self, user_id: int) -> Optional[str]:
+        user = self.get(user_id)
+        return user["full_name"] if user else None
+
+
+def get_user_lookup() -> UserLookup:
+    """FastAPI dependency: a fresh lookup per request."""
+    return UserLookup()
@@ -0,0 +1,61 @@
+from datetime import date
+from typing import Dict, Optional
+
+from sqlalchemy import DateTime, func
+from sqlalchemy.orm import Session
+
+from app.db.models.models import Appointment
+from app.utils.local_time import LOCAL_TZ_NAME, local_day_bounds
+
+# date_trunc field -> bucket key format
+GRANULARITIES = {
+    "day": "%Y-%m-%d",
+    "hour": "%Y-%m-%dT%H:00",
+}
+
+
+def local_bucket(granularity: str):
+    # appointment_date is naive UTC: tag it as UTC, shift to Dhaka wall time, then truncate
+    local_time = func.timezone(LOCAL_TZ_NAME, func.timezone("UTC", Appointment.appointment_date))
+    return func.date_trunc(granularity, local_time, type_=DateTime)
+
+
+def appointment_calendar(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    granularity: str = "day",
+    doctor_id: Optional[int] = None
+) -> Dict:
+    """
+    Appointment counts per Dhaka day (or hour) and status between start_date and
+    end_date inclusive, for one doctor or, without doctor_id, every doctor.
+    One GROUP BY in the database; empty buckets and zero counts are left out.
+    """
+    start, end = local_day_bounds(start_date, end_date)
+    bucket = local_bucket(granularity).label("bucket")
+    query = db.query(bucket, Appointment.status, func.count(Appointment.id)).filter(
+        Appointment.appointment_date >= start,
+        Appointment.appointment_date < end
+    )
+    if doctor_id is not None:
+        query = query.filter(Appointment.doctor_id == doctor_id)
+
+    # Group/order by the output label: repeating the expression would repeat its bind parameters
+    key_format = GRANULARITIES[granularity]
+    counts: Dict[str, Dict[str, int]] = {}
+    totals: Dict[str, int] = {}
+    for bucket_start, appointment_status, count in query.group_by("bucket", Appointment.status).order_by("bucket"):
+        status_name = appointment_status.value
+        counts.setdefault(bucket_start.strftime(key_format), {})[status_name] = count
+        totals[status_name] = totals.get(status_name, 0) + count
+
+    return {
+        "doctor_id": doctor_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "granularity": granularity,
+        "timezone": LOCAL_TZ_NAME,
+        "counts": counts,
+        "totals": totals,
+    }
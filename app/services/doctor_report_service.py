@@ -0,0 +1,228 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models.models import Appointment, AppointmentStatus, DoctorReport
+from app.services.cache_user_service import get_users_info
+from app.utils.local_time import LOCAL_TZ, month_bounds, to_local, utc_naive
+
+# (doctor_id, year, month)
+ReportKey = Tuple[int, int, int]
+
+
+def previous_month(today: date) -> Tuple[int, int]:
+    first = today.replace(day=1)
+    last_month = first - timedelta(days=1)
+    return last_month.year, last_month.month
+
+
+def current_month() -> Tuple[int, int]:
+    today = datetime.now(LOCAL_TZ).date()
+    return today.year, today.month
+
+
+def month_of(appointment_date: datetime) -> Tuple[int, int]:
+    """Dhaka calendar month an appointment is reported under (naive values are UTC)."""
+    local = to_local(appointment_date)
+    return local.year, local.month
+
+
+def doctor_fee(doctor: Optional[dict]) -> float:
+    return float((doctor or {}).get("consultation_fee") or 0)
+
+
+# ---- full rebuild -------------------------------------------------------------
+
+def aggregate_month(db: Session, year: int, month: int) -> List[dict]:
+    """One GROUP BY doctor_id over the month: booked (non-cancelled) and completed counts."""
+    start, end = month_bounds(year, month)
+    completed = func.count(case((Appointment.status == AppointmentStatus.COMPLETED, 1)))
+    rows = db.query(
+        Appointment.doctor_id,
+        func.count(Appointment.id).label("total_appointments"),
+        completed.label("total_patient_visits"),
+    ).filter(
+        Appointment.appointment_date >= start,
+        Appointment.appointment_date < end,
+        Appointment.status != AppointmentStatus.CANCELLED,
+        Appointment.doctor_id.isnot(None)
+    ).group_by(Appointment.doctor_id).all()
+
+    doctors = get_users_info(row.doctor_id for row in rows)
+    return [
+        {
+            "doctor_id": row.doctor_id,
+            "year": year,
+            "month": month,
+            "total_appointments": row.total_appointments,
+            "total_patient_visits": row.total_patient_visits,
+            "total_earnings": row.total_patient_visits * doctor_fee(doctors.get(row.doctor_id)),
+        }
+        for row in rows
+    ]
+
+
+REPORT_TOTALS = ("total_appointments", "total_patient_visits", "total_earnings")
+
+
+def upsert_reports(db: Session, reports: List[dict]) -> int:
+    """
+    Bulk insert-or-replace DoctorReport rows keyed on (doctor_id, year, month).
+    Rows whose totals are already current are left alone; returns how many were written.
+    """
+    if not reports:
+        return 0
+    stmt = insert(DoctorReport).values(reports)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DoctorReport.doctor_id, DoctorReport.year, DoctorReport.month],
+        set_={
+            "total_appointments": stmt.excluded.total_appointments,
+            "total_patient_visits": stmt.excluded.total_patient_visits,
+            "total_earnings": stmt.excluded.total_earnings,
+            "generated_at": func.current_date(),
+        },
+        where=or_(*(
+            getattr(DoctorReport, column).is_distinct_from(stmt.excluded[column])
+            for column in REPORT_TOTALS
+        )),
+    )
+    return db.execute(stmt).rowcount
+
+
+def rebuild_month(db: Session, year: int, month: int) -> Tuple[List[dict], int]:
+    """
+    Recompute a month from appointments and make doctor_reports match exactly,
+    zeroing doctors that no longer have any appointments that month.
+    Returns (reports, number of rows that changed). Does not commit.
+    """
+    reports = aggregate_month(db, year, month)
+    changed = upsert_reports(db, reports)
+
+    stale = db.query(DoctorReport).filter(
+        DoctorReport.year == year,
+        DoctorReport.month == month,
+        or_(*(getattr(DoctorReport, column).is_distinct_from(0) for column in REPORT_TOTALS)),
+    )
+    if reports:
+        stale = stale.filter(DoctorReport.doctor_id.notin_([r["doctor_id"] for r in reports]))
+    changed += stale.update(
+        {
+            DoctorReport.total_appointments: 0,
+            DoctorReport.total_patient_visits: 0,
+            DoctorReport.total_earnings: 0.0,
+            DoctorReport.generated_at: func.current_date(),
+        },
+        synchronize_session=False,
+    )
+    return reports, changed
+
+
+# ---- incremental rollups ------------------------------------------------------
+
+def _contribution(status) -> Tuple[int, int]:
+    """(appointments, visits) an appointment in `status` adds to its month's report."""
+    if status is None or status == AppointmentStatus.CANCELLED:
+        return 0, 0
+    return 1, 1 if status == AppointmentStatus.COMPLETED else 0
+
+
+def rollup_deltas(
+    before: Optional[Tuple[Optional[int], Optional[datetime], Optional[AppointmentStatus]]],
+    after: Optional[Tuple[Optional[int], Optional[datetime], Optional[AppointmentStatus]]],
+) -> Dict[ReportKey, Tuple[int, int]]:
+    """
+    Counter changes implied by an appointment moving from `before` to `after`.
+    Each side is (doctor_id, appointment_date, status), or None for create/delete.
+    Moving an appointment to another doctor or month shifts it between buckets.
+    """
+    deltas: Dict[ReportKey, List[int]] = {}
+    for side, sign in ((before, -1), (after, 1)):
+        if side is None:
+            continue
+        doctor_id, appointment_date, status = side
+        if doctor_id is None or appointment_date is None:
+            continue
+        appointments, visits = _contribution(status)
+        if not appointments:
+            continue
+        key = (doctor_id, *month_of(appointment_date))
+        bucket = deltas.setdefault(key, [0, 0])
+        bucket[0] += sign * appointments
+        bucket[1] += sign * visits
+    return {key: (a, v) for key, (a, v) in deltas.items() if a or v}
+
+
+def merge_rollup_deltas(changes) -> Dict[ReportKey, Tuple[int, int]]:
+    """rollup_deltas summed over many (before, after) changes, for batch writes."""
+    merged: Dict[ReportKey, List[int]] = {}
+    for before, after in changes:
+        for key, (appointments, visits) in rollup_deltas(before, after).items():
+            bucket = merged.setdefault(key, [0, 0])
+            bucket[0] += appointments
+            bucket[1] += visits
+    return {key: (a, v) for key, (a, v) in merged.items() if a or v}
+
+
+def rollup_statement(deltas: Dict[ReportKey, Tuple[int, int]], fees: Dict[int, float]):
+    """
+    One INSERT .. ON CONFLICT DO UPDATE adding `deltas` to doctor_reports, or None.
+    Returned rather than executed so sync and async sessions can run it in their own transaction.
+    """
+    if not deltas:
+        return None
+    # Postgres locks conflicting rows in VALUES order; a fixed order keeps concurrent batches from deadlocking
+    rows = [
+        {
+            "doctor_id": doctor_id,
+            "year": year,
+            "month": month,
+            "total_appointments": appointments,
+            "total_patient_visits": visits,
+            "total_earnings": visits * fees.get(doctor_id, 0.0),
+        }
+        for (doctor_id, year, month), (appointments, visits) in sorted(deltas.items())
+    ]
+    stmt = insert(DoctorReport).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[DoctorReport.doctor_id, DoctorReport.year, DoctorReport.month],
+        set_={
+            "total_appointments": func.coalesce(DoctorReport.total_appointments, 0) + stmt.excluded.total_appointments,
+            "total_patient_visits": func.coalesce(DoctorReport.total_patient_visits, 0) + stmt.excluded.total_patient_visits,
+            "total_earnings": func.coalesce(DoctorReport.total_earnings, 0.0) + stmt.excluded.total_earnings,
+            "generated_at": func.current_date(),
+        },
+    )
+
+
+def doctor_fees(doctor_ids) -> Dict[int, float]:
+    return {doctor_id: doctor_fee(doctor) for doctor_id, doctor in get_users_info(doctor_ids).items()}
+
+
+def report_months(deltas: Dict[ReportKey, Tuple[int, int]]) -> Set[Tuple[int, int]]:
+    """(year, month) pairs whose reports `deltas` change."""
+    return {(year, month) for _, year, month in deltas}
+
+
+def apply_rollup(db: Session, before, after) -> Set[Tuple[int, int]]:
+    """
+    Adjust doctor_reports for one appointment change inside the caller's transaction.
+    Returns the (year, month) pairs whose counters changed, empty if none did.
+    """
+    return apply_rollups(db, [(before, after)])
+
+
+def apply_rollups(db: Session, changes) -> Set[Tuple[int, int]]:
+    """apply_rollup for many changes at once: one fee MGET and one upsert."""
+    deltas = merge_rollup_deltas(changes)
+    stmt = rollup_statement(deltas, doctor_fees(key[0] for key in deltas))
+    if stmt is None:
+        return set()
+    db.execute(stmt)
+    return report_months(deltas)
+
+
+def rollup_state(appointment: Appointment):
+    return appointment.doctor_id, utc_naive(appointment.appointment_date), appointment.status
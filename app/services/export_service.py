@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from app.config import config
+from app.db.models.models import Appointment, AppointmentStatus
+from app.db.session import SessionLocal
+from app.services.cache_user_service import UserLookup
+from app.utils.local_time import utc_naive
+
+EXPORT_COLUMNS = (
+    "id", "appointment_date", "doctor_id", "doctor_name",
+    "patient_id", "patient_name", "status", "notes", "created_at",
+)
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def apply_appointment_filters(
+    stmt,
+    doctor_id: Optional[int] = None,
+    status: Optional[AppointmentStatus] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+):
+    """Admin list/export filters; works on both Query and Select. Naive bounds are UTC."""
+    if doctor_id is not None:
+        stmt = stmt.filter(Appointment.doctor_id == doctor_id)
+    if status is not None:
+        stmt = stmt.filter(Appointment.status == status)
+    if start_date is not None:
+        stmt = stmt.filter(Appointment.appointment_date >= utc_naive(start_date))
+    if end_date is not None:
+        stmt = stmt.filter(Appointment.appointment_date <= utc_naive(end_date))
+    return stmt
+
+
+def _iter_export_rows(**filters) -> Iterator[dict]:
+    """
+    Stream matching appointments from a server-side cursor, one chunk at a time,
+    with names resolved per chunk through the batched user cache.
+    Owns its session: FastAPI closes dependency sessions before a streamed body is sent.
+    """
+    stmt = apply_appointment_filters(
+        select(
+            Appointment.id,
+            Appointment.appointment_date,
+            Appointment.doctor_id,
+            Appointment.patient_id,
+            Appointment.status,
+            Appointment.notes,
+            Appointment.created_at,
+        ),
+        **filters
+    ).order_by(Appointment.appointment_date, Appointment.id)
+
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=config.EXPORT_CHUNK_SIZE))
+        for chunk in result.partitions():
+            # Names are only kept for the chunk in flight, so memory stays flat
+            users = UserLookup()
+            users.prefetch(uid for row in chunk for uid in (row.doctor_id, row.patient_id))
+            for row in chunk:
+                yield {
+                    "id": row.id,
+                    "appointment_date": row.appointment_date.isoformat() if row.appointment_date else None,
+                    "doctor_id": row.doctor_id,
+                    "doctor_name": users.full_name(row.doctor_id),
+                    "patient_id": row.patient_id,
+                    "patient_name": users.full_name(row.patient_id),
+                    "status": row.status.value if row.status else None,
+                    "notes": row.notes,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                }
+    finally:
+        db.close()
+
+
+def iter_csv(**filters) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for i, row in enumerate(_iter_export_rows(**filters), 1):
+        writer.writerow(row)
+        if i % config.EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_ndjson(**filters) -> Iterator[str]:
+    lines = []
+    for row in _iter_export_rows(**filters):
+        lines.append(json.dumps(row))
+        if len(lines) >= config.EXPORT_CHUNK_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+EXPORT_WRITERS = {
+    "csv": iter_csv,
+    "ndjson": iter_ndjson,
+}
@@ -1,66 +1,253 @@
+from app.config import config
 from app.db.session import get_db
-from app.db.models.models import Appointment, UserModel, AppointmentStatus
-from datetime import datetime, timedelta
+from app.db.models.models import Appointment, AppointmentStatus
+from app.services.cache_user_service import get_users_info
+from app.services.reminder_timer_service import claim_due_reminders, reminder_offsets, retry_reminders, sync_reminders_many
+from app.utils.local_time import LOCAL_TZ, to_local, tomorrow_bounds
+from app.utils.rate_limit import acquire_rate_slot
+from app.utils.redis_client import redis_client
+from celery import group
+from celery.signals import beat_init
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from typing import List
 from app.worker import celery_app
-import pytz
-from zoneinfo import ZoneInfo
-from fastapi import Depends, Query
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+DAILY_REMINDER = "daily"
+# Timer kinds at least this far ahead send the same day-before reminder as the daily scan
+DAY_BEFORE_MIN_OFFSET = timedelta(hours=12)
+
+
+def reminder_group(kind: str) -> str:
+    """
+    Kinds that deliver the same reminder share one idempotency key: the daily scan
+    and e.g. the 24h timer both mean "tomorrow", so whichever runs first wins.
+    """
+    offset = reminder_offsets().get(kind)
+    if offset is not None and offset >= DAY_BEFORE_MIN_OFFSET:
+        return DAILY_REMINDER
+    return kind
+
+
+def reminder_key(appt: Appointment, kind: str) -> str:
+    # Includes the appointment time, so a rescheduled appointment is reminded again
+    return f"reminder:sent:{appt.id}:{reminder_group(kind)}:{appt.appointment_date.isoformat()}"
+
+
+def build_reminder(appt: Appointment, patient: dict, doctor: dict):
+    subject = "Appointment Reminder"
+    local_time = to_local(appt.appointment_date)
+    doctor_name = doctor["full_name"] if doctor else "your doctor"
+    message = (
+        f"Dear {patient['full_name']},\n\n"
+        f"This is a reminder for your appointment with Dr. {doctor_name} on {local_time.strftime('%Y-%m-%d %H:%M')}.\n"
+        "Please be on time.\n\nThanks!"
+    )
+    return subject, message
+
+
+def deliver_reminder(to: str, subject: str, body: str) -> None:
+    # No mail transport is wired into this service yet
+    print(f"[Reminder] To: {to} | Subject: {subject}\n{body}")
+
+
+def _send_once(appt: Appointment, patient: dict, doctor: dict, kind: str) -> bool:
+    """Claim the idempotency key, then send; the claim is released if sending fails."""
+    key = reminder_key(appt, kind)
+    if not redis_client.set(key, 1, nx=True, ex=config.REMINDER_IDEMPOTENCY_TTL):
+        return False
+    try:
+        acquire_rate_slot("reminders", config.REMINDER_SEND_RATE_PER_SECOND)
+        subject, message = build_reminder(appt, patient, doctor)
+        deliver_reminder(patient["email"], subject, message)
+    except Exception:
+        redis_client.delete(key)
+        raise
+    return True
+
+
+def send_reminders(appointments: List[Appointment], kind: str = DAILY_REMINDER) -> dict:
+    """
+    Send reminders for a batch concurrently, resolving all of its users with a single MGET.
+    Appointments already reminded (per Redis idempotency key) are skipped; the ids of
+    failed sends are returned in "failed_ids".
+    """
+    users = get_users_info(
+        user_id for appt in appointments for user_id in (appt.patient_id, appt.doctor_id)
+    )
+    jobs = []
+    for appt in appointments:
+        patient = users.get(appt.patient_id)
+        if patient and patient.get("email"):
+            jobs.append((appt, patient, users.get(appt.doctor_id)))
+
+    sent = 0
+    failed_ids = []
+    with ThreadPoolExecutor(max_workers=max(1, config.REMINDER_SEND_CONCURRENCY)) as pool:
+        futures = [(appt, pool.submit(_send_once, appt, patient, doctor, kind)) for appt, patient, doctor in jobs]
+        for appt, future in futures:
+            try:
+                sent += bool(future.result())
+            except Exception:
+                failed_ids.append(appt.id)
+                logger.exception("Failed to send appointment reminder")
+
+    return {
+        "processed": len(appointments),
+        "sent": sent,
+        "skipped": len(jobs) - sent - len(failed_ids),
+        "failed": len(failed_ids),
+        "failed_ids": failed_ids,
+    }
+
+
+@celery_app.task(name="app.services.reminder.send_reminder_batch")
+def send_reminder_batch(appointment_ids: List[int], kind: str = DAILY_REMINDER):
+    started = time.perf_counter()
+    db: Session = next(get_db())
+    try:
+        appointments = db.execute(
+            select(Appointment).where(
+                Appointment.id.in_(appointment_ids),
+                Appointment.status == AppointmentStatus.CONFIRMED
+            )
+        ).scalars().all()
+        stats = send_reminders(appointments, kind)
+    finally:
+        db.close()
+
+    stats["duration_seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("Reminder batch of %d: %s", len(appointment_ids), stats)
+    return stats
 
 
 @celery_app.task(name="app.services.reminder.send_daily_appointment_reminders")
 def send_daily_appointment_reminders():
-    db = next(get_db())
+    """
+    Coordinator: stream the ids of tomorrow's confirmed appointments and fan them
+    out as a group of send_reminder_batch subtasks. No longer scheduled (the timers
+    drained by drain_due_reminders cover it); kept for manual runs.
+    """
+    db: Session = next(get_db())
+    batches = []
 
+    try:
+        start, end = tomorrow_bounds(datetime.now(LOCAL_TZ))
+        stmt = (
+            select(Appointment.id)
+            .where(
+                Appointment.appointment_date >= start,
+                Appointment.appointment_date < end,
+                Appointment.status == AppointmentStatus.CONFIRMED
+            )
+            .order_by(Appointment.appointment_date, Appointment.id)
+            .execution_options(yield_per=config.REMINDER_BATCH_SIZE)
+        )
+        for chunk in db.execute(stmt).scalars().partitions():
+            batches.append(list(chunk))
+    finally:
+        db.close()
+
+    if batches:
+        group(send_reminder_batch.s(ids, DAILY_REMINDER) for ids in batches).apply_async()
+
+    stats = {"appointments": sum(len(ids) for ids in batches), "batches": len(batches)}
+    logger.info("Daily appointment reminders dispatched: %s", stats)
+    return stats
 
+
+@celery_app.task(name="app.services.reminder.backfill_reminder_timers")
+def backfill_reminder_timers():
+    """
+    Arm timers for every future confirmed appointment. Timers are otherwise only
+    armed when an appointment is created or changes status, so this covers ones
+    confirmed before timers existed or lost from Redis. Idempotent: ZADD just
+    rewrites the due time of timers that are already armed.
+    """
+    db: Session = next(get_db())
+    appointments = 0
     try:
-        now = datetime.now(ZoneInfo("Asia/Dhaka"))
-        target_time = now + timedelta(days=1)
-        start = target_time.replace(hour=0, minute=0, second=0, microsecond=0)
-        end = target_time.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-        appointments = db.query(Appointment).filter(
-            Appointment.appointment_date >= start,
-            Appointment.appointment_date <= end,
-            Appointment.status == AppointmentStatus.CONFIRMED.value
-        ).all()
-
-        for appt in appointments:
-            patient = db.query(UserModel).filter(UserModel.id == appt.patient_id).first()
-            doctor = db.query(UserModel).filter(UserModel.id == appt.doctor_id).first()
-
-            if patient and patient.email:
-                subject = "Appointment Reminder"
-                message = (
-                    f"Dear {patient.full_name},\n\n"
-                    f"This is a reminder for your appointment with Dr. {doctor.full_name} on {appt.appointment_date.strftime('%Y-%m-%d %H:%M')}.\n"
-                    "Please be on time.\n\nThanks!"
-                )
-                print(to=patient.email, subject=subject, body=message)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        stmt = (
+            select(Appointment)
+            .where(
+                Appointment.appointment_date > now,
+                Appointment.status == AppointmentStatus.CONFIRMED
+            )
+            .order_by(Appointment.appointment_date, Appointment.id)
+            .execution_options(yield_per=config.REMINDER_BATCH_SIZE)
+        )
+        for chunk in db.execute(stmt).scalars().partitions():
+            sync_reminders_many(chunk)
+            appointments += len(chunk)
     finally:
         db.close()
 
+    logger.info("Reminder timers backfilled for %d appointments", appointments)
+    return {"appointments": appointments}
+
+
+@beat_init.connect
+def _backfill_on_beat_start(sender=None, **kwargs):
+    # Beat is what schedules drain_due_reminders, so every (re)start re-arms missing timers first
+    backfill_reminder_timers.delay()
 
-# @celery_app.task
-# def send_daily_appointment_reminders():
-#     print("Running daily appointment reminders...")
 
-#     db: Session = next(get_db())
+@celery_app.task(name="app.services.reminder.drain_due_reminders")
+def drain_due_reminders(max_rounds: int = 10):
+    """
+    Poller for per-appointment timers: claim due entries from the sorted set in
+    small batches and send them, skipping appointments that are no longer
+    confirmed or already started. Timers whose send fails are re-armed after
+    REMINDER_RETRY_DELAY, until the appointment starts.
+    """
+    totals = {"claimed": 0, "sent": 0, "skipped": 0, "failed": 0}
+    for _ in range(max_rounds):
+        claimed = claim_due_reminders(config.REMINDER_DRAIN_BATCH)
+        if not claimed:
+            break
+        totals["claimed"] += len(claimed)
 
-#     dhaka_tz = pytz.timezone("Asia/Dhaka")
-#     target_time = datetime.now(dhaka_tz) + timedelta(days=1)
-#     day_start = target_time.replace(hour=0, minute=0, second=0, microsecond=0)
-#     day_end = day_start + timedelta(days=1)
+        by_kind = defaultdict(list)
+        for appointment_id, kind in claimed:
+            by_kind[kind].append(appointment_id)
 
-#     appointments = db.query(Appointment).filter(
-#         Appointment.appointment_date >= day_start,
-#         Appointment.appointment_date < day_end,
-#         Appointment.status == AppointmentStatus.CONFIRMED.value
-#     ).all()
+        db: Session = next(get_db())
+        try:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            for kind, ids in by_kind.items():
+                try:
+                    appointments = db.execute(
+                        select(Appointment).where(
+                            Appointment.id.in_(ids),
+                            Appointment.status == AppointmentStatus.CONFIRMED,
+                            Appointment.appointment_date > now
+                        )
+                    ).scalars().all()
+                    stats = send_reminders(appointments, kind)
+                except Exception:
+                    # Claiming removed these timers; put them all back rather than lose them
+                    logger.exception("Failed to send %s reminders", kind)
+                    retry_reminders([(appointment_id, kind) for appointment_id in ids], config.REMINDER_RETRY_DELAY)
+                    totals["failed"] += len(ids)
+                    continue
+                retry_reminders([(appointment_id, kind) for appointment_id in stats["failed_ids"]], config.REMINDER_RETRY_DELAY)
+                totals["sent"] += stats["sent"]
+                totals["skipped"] += stats["skipped"] + len(ids) - len(appointments)
+                totals["failed"] += stats["failed"]
+        finally:
+            db.close()
 
-#     for appt in appointments:
-#         patient = db.query(UserModel).filter(UserModel.id == appt.patient_id).first()
-#         if patient:
-#             print(f"[Reminder] To: {patient.email} | Appointment at: {appt.appointment_date}")
+        if len(claimed) < config.REMINDER_DRAIN_BATCH:
+            break
 
-#     db.close()
\ No newline at end of file
+    if totals["claimed"]:
+        logger.info("Drained due reminders: %s", totals)
+    return totals
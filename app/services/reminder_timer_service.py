@@ -0,0 +1,105 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from app.config import config
+from app.db.models.models import Appointment, AppointmentStatus
+from app.utils.redis_client import redis_client
+
+# Sorted set of pending reminders: member "{appointment_id}:{kind}", score = due unix time
+REMINDER_TIMERS_KEY = "reminders:due"
+
+
+def reminder_offsets() -> Dict[str, timedelta]:
+    """Reminder kinds and how long before the appointment each is due, e.g. {"24h": 24h, "1h": 1h}."""
+    return {f"{hours}h": timedelta(hours=hours) for hours in config.REMINDER_OFFSETS_HOURS}
+
+
+def _member(appointment_id: int, kind: str) -> str:
+    return f"{appointment_id}:{kind}"
+
+
+def _as_utc(value: datetime) -> datetime:
+    # appointment_date is a naive column holding UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _queue_schedule(pipe, appointment: Appointment) -> None:
+    appointment_at = _as_utc(appointment.appointment_date)
+    now = time.time()
+    due = {}
+    for kind, offset in reminder_offsets().items():
+        due_at = (appointment_at - offset).timestamp()
+        if due_at > now:
+            due[_member(appointment.id, kind)] = due_at
+
+    # Drop kinds that are no longer reachable (e.g. moved closer than 24h)
+    _queue_cancel(pipe, appointment.id)
+    if due:
+        pipe.zadd(REMINDER_TIMERS_KEY, due)
+
+
+def _queue_cancel(pipe, appointment_id: int) -> None:
+    pipe.zrem(REMINDER_TIMERS_KEY, *[_member(appointment_id, kind) for kind in reminder_offsets()])
+
+
+def schedule_reminders(appointment: Appointment) -> None:
+    """(Re)arm an appointment's timers; ZADD overwrites the due time of a rescheduled one."""
+    pipe = redis_client.pipeline()
+    _queue_schedule(pipe, appointment)
+    pipe.execute()
+
+
+def cancel_reminders(appointment_id: int) -> None:
+    pipe = redis_client.pipeline()
+    _queue_cancel(pipe, appointment_id)
+    pipe.execute()
+
+
+def sync_reminders(appointment: Appointment) -> None:
+    """Timers follow the appointment: armed while confirmed, removed otherwise."""
+    sync_reminders_many([appointment])
+
+
+def sync_reminders_many(appointments: List[Appointment]) -> None:
+    """sync_reminders for a batch in one Redis round trip."""
+    if not appointments:
+        return
+    pipe = redis_client.pipeline()
+    for appointment in appointments:
+        if appointment.status == AppointmentStatus.CONFIRMED:
+            _queue_schedule(pipe, appointment)
+        else:
+            _queue_cancel(pipe, appointment.id)
+    pipe.execute()
+
+
+def claim_due_reminders(limit: int) -> List[Tuple[int, str]]:
+    """
+    Pop up to `limit` due timers. ZREM decides ownership, so concurrent pollers
+    never hand the same timer to two workers.
+    """
+    members = redis_client.zrangebyscore(REMINDER_TIMERS_KEY, "-inf", time.time(), start=0, num=limit)
+    if not members:
+        return []
+    pipe = redis_client.pipeline()
+    for member in members:
+        pipe.zrem(REMINDER_TIMERS_KEY, member)
+    claimed = []
+    for member, removed in zip(members, pipe.execute()):
+        if removed:
+            appointment_id, kind = member.split(":", 1)
+            claimed.append((int(appointment_id), kind))
+    return claimed
+
+
+def retry_reminders(claimed: List[Tuple[int, str]], delay: float) -> None:
+    """
+    Put claimed timers whose send failed back, due again in `delay` seconds.
+    NX keeps a timer that was re-armed in the meantime (e.g. by a reschedule).
+    """
+    if not claimed:
+        return
+    due_at = time.time() + delay
+    due = {_member(appointment_id, kind): due_at for appointment_id, kind in claimed}
+    redis_client.zadd(REMINDER_TIMERS_KEY, due, nx=True)
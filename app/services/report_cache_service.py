@@ -0,0 +1,97 @@
+import hashlib
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from app.config import config
+from app.utils.redis_client import redis_client, async_redis_client
+
+# Every cached response embeds the version of the data it was built from. Versions are
+# kept per month, per year and overall, and a change to a month bumps all three, so a
+# booking only invalidates responses that can include that month.
+REPORTS_VERSION_KEY = "reports:cache:version"
+
+Month = Tuple[int, int]
+
+
+def reports_version_key(year: Optional[int] = None, month: Optional[int] = None) -> str:
+    """The narrowest version counter covering a report query filtered on year/month."""
+    if year is None:
+        return REPORTS_VERSION_KEY
+    if month is None:
+        return f"{REPORTS_VERSION_KEY}:{year}"
+    return f"{REPORTS_VERSION_KEY}:{year}-{month:02d}"
+
+
+def _version_keys(months: Iterable[Month]) -> List[str]:
+    months = set(months)
+    if not months:
+        return []
+    keys = {REPORTS_VERSION_KEY}
+    for year, month in months:
+        keys.add(reports_version_key(year))
+        keys.add(reports_version_key(year, month))
+    return sorted(keys)
+
+
+def bump_reports_version(months: Iterable[Month]) -> None:
+    """Invalidate cached responses covering any of `months` ((year, month) pairs)."""
+    keys = _version_keys(months)
+    if not keys:
+        return
+    pipe = redis_client.pipeline(transaction=False)
+    for key in keys:
+        pipe.incr(key)
+    pipe.execute()
+
+
+async def abump_reports_version(months: Iterable[Month]) -> None:
+    keys = _version_keys(months)
+    if not keys:
+        return
+    pipe = async_redis_client.pipeline(transaction=False)
+    for key in keys:
+        pipe.incr(key)
+    await pipe.execute()
+
+
+def current_reports_version(year: Optional[int] = None, month: Optional[int] = None) -> int:
+    return int(redis_client.get(reports_version_key(year, month)) or 0)
+
+
+def _cache_key(version: int, kind: str, *params) -> str:
+    return f"reports:cache:v{version}:{kind}:" + ":".join("" if p is None else str(p) for p in params)
+
+
+def make_etag(version: int, kind: str, *params) -> str:
+    """
+    The ETag depends only on the data version and the filters, so a matching
+    If-None-Match can be answered with a 304 without reading the cached body.
+    """
+    digest = hashlib.sha1(_cache_key(version, kind, *params).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def get_or_build(
+    kind: str,
+    params: Tuple,
+    build: Callable[[], str],
+    if_none_match: Optional[str] = None,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+) -> Tuple[Optional[str], str]:
+    """
+    Return (body, etag) for a report response; body is None when if_none_match is still current.
+    `year`/`month` are the query's filters and pick the version it depends on. Bodies are
+    stored as JSON text under a versioned key (redis_client decodes to str), so a bump
+    orphans every body it covers at once.
+    """
+    version = current_reports_version(year, month)
+    etag = make_etag(version, kind, *params)
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return None, etag
+
+    key = _cache_key(version, kind, *params)
+    body = redis_client.get(key)
+    if body is None:
+        body = build()
+        redis_client.set(key, body, ex=config.REPORT_CACHE_TTL)
+    return body, etag
@@ -1,36 +1,53 @@
 from app.db.session import get_db
-from app.db.models.models import Appointment, UserModel
-from datetime import datetime, timedelta
+from app.services.doctor_report_service import current_month, previous_month, rebuild_month
+from app.utils.local_time import LOCAL_TZ
+from app.services.report_cache_service import bump_reports_version
+from datetime import datetime
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.worker import celery_app
-import pytz
+import logging
+
+logger = logging.getLogger(__name__)
+
 
 @celery_app.task
-def generate_monthly_report():
-    print("Generating monthly doctor report...")
+def generate_monthly_report(year: Optional[int] = None, month: Optional[int] = None):
+    """Build DoctorReport rows for a month; defaults to the month that just ended."""
+    if year is None or month is None:
+        year, month = previous_month(datetime.now(LOCAL_TZ).date())
+    logger.info("Generating monthly doctor report for %d-%02d", year, month)
+
+    db: Session = next(get_db())
+    try:
+        reports, changed = rebuild_month(db, year, month)
+        db.commit()
+    finally:
+        db.close()
+    if changed:
+        bump_reports_version([(year, month)])
+
+    logger.info("Stored %d doctor reports for %d-%02d", len(reports), year, month)
+    return len(reports)
+
+
+@celery_app.task(name="app.services.reports.reconcile_doctor_reports")
+def reconcile_doctor_reports():
+    """
+    Correct drift in the incrementally maintained rollups for the current month
+    (and the previous one, which can still change during its first days).
+    """
+    year, month = current_month()
+    months = {(year, month), previous_month(datetime.now(LOCAL_TZ).date())}
 
+    changed = {}
     db: Session = next(get_db())
-    now = datetime.now(pytz.timezone("Asia/Dhaka"))
-    first_day = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    last_day = now
-
-    doctors = db.query(UserModel).filter(UserModel.user_type == "DOCTOR").all()
-    print("\n--- Monthly Doctor Report ---")
-
-    for doctor in doctors:
-        appointments = db.query(Appointment).filter(
-            Appointment.doctor_id == doctor.id,
-            Appointment.appointment_date >= first_day,
-            Appointment.appointment_date <= last_day,
-            Appointment.status == "COMPLETED"
-        ).all()
-
-        total_appointments = len(appointments)
-        earnings = total_appointments * (doctor.consultation_fee or 0)
-
-        print(f"Doctor: {doctor.full_name}")
-        print(f"  Total Visits: {total_appointments}")
-        print(f"  Total Earnings: {earnings} BDT")
-        print("")
-
-    db.close()
\ No newline at end of file
+    try:
+        for y, m in sorted(months):
+            changed[(y, m)] = rebuild_month(db, y, m)[1]
+        db.commit()
+    finally:
+        db.close()
+    # Cached report bodies stay valid unless the reconcile actually corrected their month
+    bump_reports_version(period for period, rows in changed.items() if rows)
+    return sum(changed.values())
@@ -0,0 +1,66 @@
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.config import config
+from app.db.models.models import Appointment, AppointmentStatus
+from app.db.session import SessionLocal
+from app.services.availability_service import get_doctor_availability
+from app.services.cache_user_service import get_users_info
+from app.utils.location_data import get_location_index
+
+logger = logging.getLogger(__name__)
+
+
+def active_doctor_ids(db: Session, days: int, limit: int) -> List[int]:
+    """Doctors with a booking in the next `days` days, i.e. the ones about to be looked up."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = db.query(Appointment.doctor_id).filter(
+        Appointment.appointment_date >= now,
+        Appointment.appointment_date < now + timedelta(days=days),
+        Appointment.status != AppointmentStatus.CANCELLED,
+        Appointment.doctor_id.isnot(None)
+    ).distinct().limit(limit).all()
+    return [row.doctor_id for row in rows]
+
+
+def warm_doctor_availability(db: Session, days: int) -> int:
+    """
+    Fetch active doctors with one MGET (filling the L1 user cache) and compile
+    their timeslots. Also opens this process's first DB and Redis connections.
+    """
+    doctor_ids = active_doctor_ids(db, days, config.USER_CACHE_L1_MAXSIZE)
+    doctors = get_users_info(doctor_ids)
+    return sum(
+        1 for doctor_id, doctor in doctors.items()
+        if get_doctor_availability(doctor_id, doctor) is not None
+    )
+
+
+def warm_up() -> dict:
+    """
+    Worker warm-up, run before a worker takes traffic. Failures are logged and
+    skipped: a cold cache is slower, not broken.
+    """
+    stats = {}
+    started = time.perf_counter()
+    try:
+        index = get_location_index()
+        stats["divisions"] = len(index.divisions)
+    except Exception:
+        logger.exception("Warm-up: failed to load the location index")
+
+    db = SessionLocal()
+    try:
+        stats["doctors"] = warm_doctor_availability(db, config.WARMUP_DOCTOR_DAYS)
+    except Exception:
+        logger.exception("Warm-up: failed to preload doctor availability")
+    finally:
+        db.close()
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info("Warm-up done: %s", stats)
+    return stats
@@ -0,0 +1,25 @@
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+
+# Headers of the injected `response` that describe its (empty) body, not ours
+_BODY_HEADERS = ("content-length", "content-type")
+
+
+def orjson_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """
+    Encode `content` with orjson and return it as the response.
+
+    Returning a Response skips FastAPI's response_model validation and
+    jsonable_encoder pass, so only use it for data built from trusted columns
+    that already matches the declared response_model (which still documents it).
+    Headers set on the injected `response` (e.g. X-Next-Cursor) are carried over.
+    """
+    headers = None
+    if response is not None:
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name not in _BODY_HEADERS
+        }
+    return Response(orjson.dumps(content), status_code=status_code, media_type="application/json", headers=headers)
@@ -0,0 +1,44 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Tuple
+
+import pytz
+
+# Doctors' hours, reminders, reports and calendars all follow Dhaka wall time.
+# appointment_date is stored as naive UTC; naive values below are UTC unless noted.
+LOCAL_TZ_NAME = "Asia/Dhaka"
+LOCAL_TZ = pytz.timezone(LOCAL_TZ_NAME)
+
+
+def utc_naive(value: datetime) -> datetime:
+    # appointment_date is a naive column; naive values are treated as UTC
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_local(value: datetime) -> datetime:
+    # Naive values are UTC, like appointment_date
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(LOCAL_TZ)
+
+
+def local_midnight(day: date) -> datetime:
+    """00:00 of a Dhaka calendar day as naive UTC."""
+    return utc_naive(LOCAL_TZ.localize(datetime.combine(day, time.min)))
+
+
+def local_day_bounds(start_date: date, end_date: date) -> Tuple[datetime, datetime]:
+    """[start_date 00:00, end_date + 1 day 00:00) in Dhaka, as naive UTC like appointment_date."""
+    return local_midnight(start_date), local_midnight(end_date + timedelta(days=1))
+
+
+def tomorrow_bounds(now: datetime) -> Tuple[datetime, datetime]:
+    """[start, end) of the Dhaka day after `now`, as naive UTC."""
+    tomorrow = to_local(now).date() + timedelta(days=1)
+    return local_day_bounds(tomorrow, tomorrow)
+
+
+def month_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+    """[start, end) of a Dhaka calendar month as naive UTC."""
+    return local_midnight(date(year, month, 1)), local_midnight(date(year + month // 12, month % 12 + 1, 1))
@@ -1,34 +1,111 @@
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, NamedTuple, Tuple
+
+LOCATION_DATA_PATH = Path(__file__).parent.parent / "static" / "bd-dd-ui-en.JSON"
+
+
+class DistrictEntry(NamedTuple):
+    name: str
+    upazilas: Tuple[str, ...]
+    upazila_set: FrozenSet[str]
+
+
+class DivisionEntry(NamedTuple):
+    name: str
+    districts: Tuple[str, ...]
+    district_set: FrozenSet[str]
+    by_district: Mapping[str, DistrictEntry]  # keyed by case-folded district name
+
+
+class LocationIndex(NamedTuple):
+    divisions: Tuple[str, ...]
+    division_set: FrozenSet[str]
+    by_division: Mapping[str, DivisionEntry]  # keyed by case-folded division name
+
 
 def load_location_data() -> Dict:
     """Load location data from JSON file"""
-    static_path = Path(__file__).parent.parent / "static" / "bd-dd-ui-en.JSON"
-    with open(static_path, "r", encoding="utf-8") as f:
+    with open(LOCATION_DATA_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def get_divisions() -> List[str]:
+
+def _upazila_name(upazila) -> str:
+    # Most districts list plain names, a few carry {"name": ..., "unions": [...]}
+    return upazila if isinstance(upazila, str) else upazila["name"]
+
+
+def build_location_index(data: Dict) -> LocationIndex:
+    """Build an immutable, case-folded lookup index from raw location data"""
+    by_division = {}
+    for div in data["divisions"]:
+        by_district = {}
+        for dist in div["districts"]:
+            upazilas = tuple(_upazila_name(u) for u in dist["upazilas"])
+            by_district[dist["name"].casefold()] = DistrictEntry(
+                name=dist["name"],
+                upazilas=upazilas,
+                upazila_set=frozenset(upazilas),
+            )
+        districts = tuple(dist["name"] for dist in div["districts"])
+        by_division[div["name"].casefold()] = DivisionEntry(
+            name=div["name"],
+            districts=districts,
+            district_set=frozenset(districts),
+            by_district=MappingProxyType(by_district),
+        )
+    divisions = tuple(div["name"] for div in data["divisions"])
+    return LocationIndex(
+        divisions=divisions,
+        division_set=frozenset(divisions),
+        by_division=MappingProxyType(by_division),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_location_index() -> LocationIndex:
+    """Load the location file once per process and return its index"""
+    return build_location_index(load_location_data())
+
+
+def _find_district(division: str, district: str):
+    div = get_location_index().by_division.get(division.casefold())
+    if div is None:
+        return None
+    return div.by_district.get(district.casefold())
+
+
+def get_divisions() -> Tuple[str, ...]:
     """Get all division names"""
-    data = load_location_data()
-    return [div["name"] for div in data["divisions"]]
+    return get_location_index().divisions
 
-def get_districts(division: str) -> List[str]:
+
+def get_districts(division: str) -> Tuple[str, ...]:
     """Get districts for a division"""
-    data = load_location_data()
-    for div in data["divisions"]:
-        if div["name"].lower() == division.lower():
-            return [dist["name"] for dist in div["districts"]]
-    return []
+    div = get_location_index().by_division.get(division.casefold())
+    return div.districts if div else ()
+
 
-def get_upazilas(division: str, district: str) -> List[str]:
+def get_upazilas(division: str, district: str) -> Tuple[str, ...]:
     """Get upazilas/thanas for a district"""
-    data = load_location_data()
-    for div in data["divisions"]:
-        if div["name"].lower() == division.lower():
-            for dist in div["districts"]:
-                if dist["name"].lower() == district.lower():
-                    if isinstance(dist["upazilas"][0], str):
-                        return dist["upazilas"]
-                    return [upazila["name"] for upazila in dist["upazilas"]]
-    return []
\ No newline at end of file
+    dist = _find_district(division, district)
+    return dist.upazilas if dist else ()
+
+
+def is_valid_division(division: str) -> bool:
+    """Exact-name membership check for a division"""
+    return division in get_location_index().division_set
+
+
+def is_valid_district(division: str, district: str) -> bool:
+    """Exact-name membership check for a district within a division"""
+    div = get_location_index().by_division.get(division.casefold())
+    return div is not None and district in div.district_set
+
+
+def is_valid_upazila(division: str, district: str, upazila: str) -> bool:
+    """Exact-name membership check for an upazila within a district"""
+    dist = _find_district(division, district)
+    return dist is not None and upazila in dist.upazila_set
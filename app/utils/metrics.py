@@ -0,0 +1,81 @@
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Seconds; roughly doubling from 1ms to 10s
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Calls per request; anything past ~20 on one request is usually an N+1
+CALL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram (cumulative on export, like Prometheus)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative, running = {}, 0
+        for bound, c in zip(self.buckets, counts):
+            running += c
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = count
+        return {"buckets": cumulative, "sum": round(total, 6), "count": count}
+
+
+# Per-request call counters ("db", "redis"); None outside an HTTP request (Celery, startup)
+_request_calls: ContextVar[Optional[Dict[str, int]]] = ContextVar("request_calls", default=None)
+
+
+def begin_request_calls() -> Tuple[Dict[str, int], Token]:
+    calls = {"db": 0, "redis": 0}
+    return calls, _request_calls.set(calls)
+
+
+def end_request_calls(token: Token) -> None:
+    _request_calls.reset(token)
+
+
+def record_call(kind: str, n: int = 1) -> None:
+    # The dict is shared with threadpool copies of the context, so sync endpoints count too
+    calls = _request_calls.get()
+    if calls is not None:
+        calls[kind] = calls.get(kind, 0) + n
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + "}"
+
+
+def render_histogram(name: str, labels: Dict[str, str], histogram: Histogram) -> List[str]:
+    """Prometheus text-format lines for one labelled histogram series."""
+    snap = histogram.snapshot()
+    lines = [
+        f"{name}_bucket{format_labels({**labels, 'le': le})} {count}"
+        for le, count in snap["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{format_labels(labels)} {snap['sum']}")
+    lines.append(f"{name}_count{format_labels(labels)} {snap['count']}")
+    return lines
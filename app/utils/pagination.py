@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+from app.db.models.models import Appointment
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(appointment_date: datetime, appointment_id: int) -> str:
+    raw = json.dumps([appointment_date.isoformat(), appointment_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        appointment_date, appointment_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(appointment_date), int(appointment_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def paginate_appointments(
+    query: Query,
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    response: Optional[Response] = None
+) -> List[Appointment]:
+    """
+    Page an Appointment query (whole rows or selected columns including
+    appointment_date and id) ordered by (appointment_date, id).
+    With a cursor the page starts right after the cursor row (keyset, no OFFSET)
+    and skip is ignored; otherwise skip/limit behave as before.
+    When the page is full, the cursor for the next page is sent in X-Next-Cursor.
+    """
+    query = query.order_by(Appointment.appointment_date, Appointment.id)
+    if cursor:
+        after = decode_cursor(cursor)
+        query = query.filter(tuple_(Appointment.appointment_date, Appointment.id) > after)
+    else:
+        query = query.offset(skip)
+
+    appointments = query.limit(limit).all()
+
+    if response is not None and appointments and len(appointments) == limit:
+        last = appointments[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.appointment_date, last.id)
+    return appointments
@@ -0,0 +1,24 @@
+import time
+
+from app.utils.redis_client import redis_client
+
+
+def acquire_rate_slot(name: str, per_second: int) -> None:
+    """
+    Block until a slot is free in a fixed one-second window shared by every
+    process using the same Redis (INCR on a per-second key).
+    A non-positive rate disables limiting.
+    """
+    if per_second <= 0:
+        return
+    while True:
+        now = time.time()
+        window = int(now)
+        key = f"ratelimit:{name}:{window}"
+        pipe = redis_client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, 2)
+        count, _ = pipe.execute()
+        if count <= per_second:
+            return
+        time.sleep(window + 1 - now)
@@ -1,7 +1,58 @@
 import redis
+import redis.asyncio
+import redis.client
 
-redis_client = redis.Redis(
-    host='redis',  # or 'localhost' if not using Docker
-    port=6379,
+from app.config import config
+from app.utils.metrics import record_call
+
+
+# Count round trips against the current request: one per command, one per pipeline flush
+class InstrumentedPipeline(redis.client.Pipeline):
+    def execute(self, raise_on_error=True):
+        record_call("redis")
+        return super().execute(raise_on_error)
+
+
+class InstrumentedRedis(redis.Redis):
+    def execute_command(self, *args, **options):
+        record_call("redis")
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class AsyncInstrumentedPipeline(redis.asyncio.client.Pipeline):
+    async def execute(self, raise_on_error=True):
+        record_call("redis")
+        return await super().execute(raise_on_error)
+
+
+class AsyncInstrumentedRedis(redis.asyncio.Redis):
+    async def execute_command(self, *args, **options):
+        record_call("redis")
+        return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return AsyncInstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+redis_client = InstrumentedRedis(
+    host=config.REDIS_HOST,  # 'redis' in Docker, 'localhost' otherwise
+    port=config.REDIS_PORT,
     decode_responses=True  # so you don't get byte strings
 )
+
+# Same Redis for async endpoints, so they don't block the event loop
+async_redis_client = AsyncInstrumentedRedis(
+    host=config.REDIS_HOST,
+    port=config.REDIS_PORT,
+    decode_responses=True
+)
+
+
+def reset_redis_after_fork() -> None:
+    # redis-py also notices the pid change on checkout; resetting up front keeps
+    # a worker from ever touching its parent's sockets
+    redis_client.connection_pool.reset()
+    async_redis_client.connection_pool.reset()
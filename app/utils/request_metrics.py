@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from app.utils.metrics import (
+    CALL_COUNT_BUCKETS, DEFAULT_LATENCY_BUCKETS, Histogram, begin_request_calls, end_request_calls,
+    render_histogram
+)
+
+# Requests that matched no route share one label so scanners can't blow up cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestMetrics:
+    """Per-route latency and DB/Redis call histograms plus an in-flight gauge."""
+
+    def __init__(self):
+        self._latency: Dict[Tuple[str, str, str], Histogram] = {}
+        self._calls: Dict[Tuple[str, str, str], Histogram] = {}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _series(self, table: Dict, key: Tuple[str, str, str], buckets) -> Histogram:
+        histogram = table.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = table.setdefault(key, Histogram(buckets))
+        return histogram
+
+    def started(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float, calls: Dict[str, int]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._series(self._latency, (method, route, str(status)), DEFAULT_LATENCY_BUCKETS).observe(seconds)
+        for kind, count in calls.items():
+            self._series(self._calls, (method, route, kind), CALL_COUNT_BUCKETS).observe(count)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            latency = sorted(self._latency.items())
+            calls = sorted(self._calls.items())
+        lines: List[str] = [
+            "# HELP http_requests_in_flight Requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self._in_flight}",
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), histogram in latency:
+            labels = {"method": method, "route": route, "status": status}
+            lines.extend(render_histogram("http_request_duration_seconds", labels, histogram))
+
+        for kind, help_text in (("db", "SQL statements executed"), ("redis", "Redis round trips")):
+            name = f"http_request_{kind}_calls"
+            lines.append(f"# HELP {name} {help_text} per request.")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route, series_kind), histogram in calls:
+                if series_kind == kind:
+                    lines.extend(render_histogram(name, {"method": method, "route": route}, histogram))
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware, so streaming responses pass through).
+    Labels by route template, e.g. /api/doctors/{doctor_id}/free_slots, which
+    the router writes into the scope during dispatch.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        calls, token = begin_request_calls()
+        self.metrics.started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self.metrics.finished(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - started,
+                calls,
+            )
+            end_request_calls(token)
@@ -0,0 +1,290 @@
+"""
+Benchmarks for the booking, listing and reporting hot paths, run offline
+against SQLite and fakeredis (see benchmarks/standins.py).
+
+    pip install -r requirements.txt -r benchmarks/requirements.txt
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --compare bench.json
+
+Latencies are per call, in milliseconds; HTTP paths go through the real
+routers, dependencies and JWT auth via an in-process ASGI client.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks import standins as standins_module
+from benchmarks.seed import SLOT_STARTS, FUTURE_DAYS, SeedSpec, seed, slot_utc
+
+SCHEMA_VERSION = 1
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    # Nearest-rank, so p99 of 100 samples is the slowest but one
+    index = max(0, min(len(sorted_samples) - 1, round(q / 100 * len(sorted_samples) + 0.5) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict:
+    ordered = sorted(samples)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "iterations": len(samples),
+        "ops_per_sec": round(len(samples) / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": ms(percentile(ordered, 50)),
+            "p90": ms(percentile(ordered, 90)),
+            "p99": ms(percentile(ordered, 99)),
+            "mean": ms(sum(ordered) / len(ordered)),
+            "min": ms(ordered[0]),
+            "max": ms(ordered[-1]),
+        },
+    }
+
+
+def measure(call: Callable[[int], None], iterations: int, warmup: int) -> Dict:
+    for i in range(warmup):
+        call(i)
+    samples = []
+    started = time.perf_counter()
+    for i in range(warmup, warmup + iterations):
+        t0 = time.perf_counter()
+        call(i)
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples, time.perf_counter() - started)
+
+
+async def ameasure(call, iterations: int, warmup: int) -> Dict:
+    for i in range(warmup):
+        await call(i)
+    samples = []
+    started = time.perf_counter()
+    for i in range(warmup, warmup + iterations):
+        t0 = time.perf_counter()
+        await call(i)
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def make_token(payload: Dict) -> str:
+    import jwt
+    from app.config import config
+
+    claims = dict(payload, exp=datetime.now(timezone.utc) + timedelta(hours=1))
+    return jwt.encode(claims, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
+
+
+def build_app():
+    from fastapi import FastAPI
+    from app.routers.appointment_router import appointment_router
+
+    app = FastAPI()
+    app.include_router(appointment_router)
+    return app
+
+
+def expect(response, status_code: int) -> None:
+    if response.status_code != status_code:
+        raise RuntimeError(
+            f"{response.request.method} {response.request.url.path} returned "
+            f"{response.status_code}, expected {status_code}: {response.text[:300]}"
+        )
+
+
+async def run_http(standins, seeded, iterations: int, warmup: int) -> Dict[str, Dict]:
+    import httpx
+    from app.config import config
+
+    app = build_app()
+    prefix = config.API_PREFIX or ""
+    doctors = seeded.doctor_ids
+    patient = {"Authorization": f"Bearer {make_token({'user_id': seeded.patient_ids[0], 'user_type': 'patient'})}"}
+    admin = {"Authorization": f"Bearer {make_token({'user_id': seeded.admin_id, 'user_type': 'admin'})}"}
+
+    async def book(i: int):
+        # Past the seeded range, one fresh slot per call
+        slot_number, doctor_index = divmod(i, len(doctors))
+        day_offset, slot = divmod(slot_number, len(SLOT_STARTS))
+        day = seeded.today + timedelta(days=FUTURE_DAYS + 1 + day_offset)
+        when = slot_utc(day, slot).replace(tzinfo=timezone.utc)
+        response = await client.post(f"{prefix}/book_appointment", headers=patient, json={
+            "doctor_id": doctors[doctor_index],
+            "appointment_date": when.isoformat(),
+            "notes": "benchmark",
+        })
+        expect(response, 201)
+
+    async def list_page(i: int):
+        params = {"limit": 20}
+        if i % 2:
+            params["doctor_id"] = doctors[i % len(doctors)]
+        response = await client.get(f"{prefix}/get_appointment_list", headers=admin, params=params)
+        expect(response, 200)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results["book_appointment"] = await ameasure(book, iterations, warmup)
+        results["get_appointment_list"] = await ameasure(list_page, iterations, warmup)
+    # aiosqlite connections run on non-daemon threads; close them on this loop
+    await standins.async_engine.dispose()
+    return results
+
+
+def run_reports(standins, seeded, iterations: int, warmup: int) -> Dict[str, Dict]:
+    # The body of generate_monthly_report, without the Celery worker around it
+    from app.services.doctor_report_service import month_of, rebuild_month
+
+    year, month = month_of(datetime.combine(seeded.today - timedelta(days=30), datetime.min.time()))
+
+    def rebuild(i: int):
+        db = standins.SessionLocal()
+        try:
+            rebuild_month(db, year, month)
+            db.commit()
+        finally:
+            db.close()
+
+    return {"generate_monthly_report": measure(rebuild, max(1, iterations // 10), min(warmup, 2))}
+
+
+async def run_serialization(standins, seeded, iterations: int, warmup: int) -> Dict[str, Dict]:
+    """
+    Serializing one 100-row list page, query and user lookup excluded: the
+    previous path (ORM objects -> AppointmentResponse -> response_model
+    validation -> JSONResponse) against the current one (column rows -> dicts
+    -> orjson).
+    """
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from app.data.schemas.appointment.appointmentschema import AppointmentResponse
+    from app.db.models.models import Appointment
+    from app.routers.appointment_router import (
+        APPOINTMENT_LIST_COLUMNS, appointment_router, build_appointment_rows
+    )
+    from app.services.cache_user_service import UserLookup
+    from app.utils.json_response import orjson_response
+
+    route = next(r for r in appointment_router.routes if r.path.endswith("/get_appointment_list"))
+    db = standins.SessionLocal()
+    try:
+        objects = db.query(Appointment).order_by(Appointment.appointment_date, Appointment.id).limit(100).all()
+        rows = db.query(*APPOINTMENT_LIST_COLUMNS).order_by(Appointment.appointment_date, Appointment.id).limit(100).all()
+    finally:
+        db.close()
+    users = UserLookup()
+    users.prefetch(user_id for a in objects for user_id in (a.doctor_id, a.patient_id))
+
+    async def pydantic_page(i: int):
+        content = [
+            AppointmentResponse(
+                id=a.id, appointment_date=a.appointment_date, doctor_id=a.doctor_id,
+                doctor_name=users.full_name(a.doctor_id), patient_id=a.patient_id,
+                patient_name=users.full_name(a.patient_id), notes=a.notes, status=a.status,
+            )
+            for a in objects
+        ]
+        JSONResponse(await serialize_response(field=route.response_field, response_content=content))
+
+    async def orjson_page(i: int):
+        orjson_response(build_appointment_rows(rows, users))
+
+    return {
+        "serialize_page_pydantic": await ameasure(pydantic_page, iterations, warmup),
+        "serialize_page_orjson": await ameasure(orjson_page, iterations, warmup),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=standins_module.REPO_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(args) -> Dict:
+    import sqlalchemy
+
+    spec = SeedSpec(doctors=args.doctors, patients=args.patients, appointments=args.appointments, seed=args.seed)
+    with tempfile.TemporaryDirectory(prefix="appointment-bench-") as workdir:
+        standins = standins_module.install(Path(workdir))
+        started = time.perf_counter()
+        seeded = seed(standins, spec)
+        seed_seconds = time.perf_counter() - started
+
+        results = asyncio.run(run_http(standins, seeded, args.iterations, args.warmup))
+        results.update(run_reports(standins, seeded, args.iterations, args.warmup))
+        results.update(asyncio.run(run_serialization(standins, seeded, args.iterations, args.warmup)))
+        standins.close()
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "database": "sqlite",
+            "redis": "fakeredis",
+            "seed": vars(spec),
+            "seed_seconds": round(seed_seconds, 2),
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict, current: Dict) -> str:
+    lines = [f"{'benchmark':<26}{'metric':<12}{'baseline':>12}{'current':>12}{'change':>10}"]
+    if baseline.get("meta", {}).get("seed") != current["meta"]["seed"]:
+        lines.insert(0, "warning: seed parameters differ from the baseline; numbers are not comparable")
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        pairs = [("p50 ms", before["latency_ms"]["p50"], result["latency_ms"]["p50"]),
+                 ("p99 ms", before["latency_ms"]["p99"], result["latency_ms"]["p99"]),
+                 ("ops/s", before["ops_per_sec"], result["ops_per_sec"])]
+        for metric, old, new in pairs:
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            lines.append(f"{name:<26}{metric:<12}{old:>12}{new:>12}{change:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--doctors", type=int, default=50)
+    parser.add_argument("--patients", type=int, default=2000)
+    parser.add_argument("--appointments", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=500, help="timed calls per HTTP path")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--output", type=Path, help="write JSON results here (default: stdout)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        print(compare(json.loads(args.compare.read_text()), report), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import json
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List
+
+from sqlalchemy import insert
+
+# Bookable half-hour slots, 09:00-16:30 Asia/Dhaka, inside every seeded doctor's hours
+DOCTOR_HOURS = "09:00-17:00"
+SLOT_STARTS = [time(9 + minutes // 60, minutes % 60) for minutes in range(0, 8 * 60, 30)]
+PAST_DAYS = 90
+FUTURE_DAYS = 30
+
+
+@dataclass
+class SeedSpec:
+    doctors: int = 50
+    patients: int = 2000
+    appointments: int = 50000
+    seed: int = 42
+
+
+@dataclass
+class Seeded:
+    spec: SeedSpec
+    today: date
+    doctor_ids: List[int]
+    patient_ids: List[int]
+    admin_id: int
+
+
+def slot_utc(day: date, slot: int) -> datetime:
+    """Naive UTC for a Dhaka slot start, the way appointment_date is stored."""
+    from app.utils.local_time import LOCAL_TZ
+
+    local = LOCAL_TZ.localize(datetime.combine(day, SLOT_STARTS[slot]))
+    return local.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _status(rng: random.Random, past: bool):
+    from app.db.models.models import AppointmentStatus
+
+    if past:
+        choices = (AppointmentStatus.COMPLETED, AppointmentStatus.CANCELLED,
+                   AppointmentStatus.CONFIRMED, AppointmentStatus.PENDING)
+        weights = (60, 15, 15, 10)
+    else:
+        choices = (AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED, AppointmentStatus.CANCELLED)
+        weights = (50, 40, 10)
+    return rng.choices(choices, weights)[0]
+
+
+def seed(standins, spec: SeedSpec) -> Seeded:
+    """
+    Doctors/patients go into Redis as `user:{id}` records, appointments into the
+    database: unique (doctor, slot) pairs spread over the last PAST_DAYS and
+    next FUTURE_DAYS days. Same spec and seed, same data (relative to today).
+    """
+    from app.db.models.models import Appointment
+
+    rng = random.Random(spec.seed)
+    today = datetime.now(timezone.utc).date()
+    doctor_ids = list(range(1, spec.doctors + 1))
+    patient_ids = list(range(spec.doctors + 1, spec.doctors + spec.patients + 1))
+    admin_id = spec.doctors + spec.patients + 1
+
+    users = {}
+    for doctor_id in doctor_ids:
+        users[f"user:{doctor_id}"] = json.dumps({
+            "id": doctor_id,
+            "user_type": "doctor",
+            "full_name": f"Doctor {doctor_id}",
+            "email": f"doctor{doctor_id}@example.com",
+            "available_timeslots": DOCTOR_HOURS,
+            "consultation_fee": rng.choice((500, 800, 1000, 1500)),
+        })
+    for patient_id in patient_ids:
+        users[f"user:{patient_id}"] = json.dumps({
+            "id": patient_id,
+            "user_type": "patient",
+            "full_name": f"Patient {patient_id}",
+            "email": f"patient{patient_id}@example.com",
+        })
+    users[f"user:{admin_id}"] = json.dumps({"id": admin_id, "user_type": "admin", "full_name": "Admin"})
+    standins.redis.mset(users)
+
+    days = PAST_DAYS + FUTURE_DAYS
+    per_day = len(SLOT_STARTS) * spec.doctors
+    total = min(spec.appointments, days * per_day)
+    first_day = today - timedelta(days=PAST_DAYS)
+    created_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    rows = []
+    for combo in rng.sample(range(days * per_day), total):
+        day_offset, rest = divmod(combo, per_day)
+        slot, doctor_index = divmod(rest, spec.doctors)
+        day = first_day + timedelta(days=day_offset)
+        rows.append({
+            "doctor_id": doctor_ids[doctor_index],
+            "patient_id": rng.choice(patient_ids),
+            "appointment_date": slot_utc(day, slot),
+            "notes": None,
+            "status": _status(rng, day < today),
+            "created_at": created_at,
+        })
+
+    with standins.engine.begin() as conn:
+        for start in range(0, len(rows), 5000):
+            conn.execute(insert(Appointment), rows[start:start + 5000])
+
+    return Seeded(spec=spec, today=today, doctor_ids=doctor_ids, patient_ids=patient_ids, admin_id=admin_id)
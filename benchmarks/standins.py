@@ -0,0 +1,123 @@
+"""
+Offline stand-ins for the services the app talks to: a throwaway SQLite database
+(sync and aiosqlite engines on the same file) in place of Postgres, and fakeredis
+in place of Redis. `install()` must run before anything imports app.routers or
+app.services, because those modules bind `redis_client` and the session
+factories at import time. Importing `app` itself is side-effect free.
+"""
+import os
+import sys
+import types
+from pathlib import Path
+
+from sqlalchemy import Date, DateTime, MetaData, create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import DefaultClause
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Tokens are minted and verified for real; only the secret is fixed
+os.environ.setdefault("JWT_SECRET", "benchmark-secret-not-for-production-use")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+
+
+def _sqlite_schema_copy(base_metadata: MetaData) -> MetaData:
+    """The models' tables with now() defaults SQLite understands; the models are untouched."""
+    metadata = MetaData()
+    for table in base_metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        for column in copy.columns:
+            if column.server_default is None:
+                continue
+            if isinstance(column.type, DateTime):
+                column.server_default = DefaultClause(text("CURRENT_TIMESTAMP"))
+            elif isinstance(column.type, Date):
+                column.server_default = DefaultClause(text("CURRENT_DATE"))
+    return metadata
+
+
+class StandIns:
+    def __init__(self, workdir: Path):
+        import fakeredis
+        import fakeredis.aioredis
+
+        from app.config import config
+
+        self.schema = config.POSTGRES_SCHEMA
+        main_db = workdir / "main.db"
+        schema_db = workdir / f"{self.schema}.db"
+        for path in (main_db, schema_db):
+            if path.exists():
+                path.unlink()
+
+        def attach_schema(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"ATTACH DATABASE '{schema_db}' AS {self.schema}")
+            cursor.execute(f"PRAGMA {self.schema}.journal_mode=WAL")
+            cursor.close()
+
+        self.engine = create_engine(f"sqlite:///{main_db}", connect_args={"check_same_thread": False})
+        self.async_engine = create_async_engine(f"sqlite+aiosqlite:///{main_db}")
+        event.listen(self.engine, "connect", attach_schema)
+        event.listen(self.async_engine.sync_engine, "connect", attach_schema)
+
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.AsyncSessionLocal = async_sessionmaker(
+            bind=self.async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+
+        server = fakeredis.FakeServer()
+        self.redis = fakeredis.FakeRedis(server=server, decode_responses=True)
+        self.async_redis = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+
+        self._install_session_module()
+        self._install_redis()
+
+        from app.db.models.models import Base
+        _sqlite_schema_copy(Base.metadata).create_all(self.engine)
+
+    def _install_session_module(self) -> None:
+        SessionLocal, AsyncSessionLocal = self.SessionLocal, self.AsyncSessionLocal
+
+        def get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        async def get_async_db():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        async def dispose_engines():
+            await self.async_engine.dispose()
+            self.engine.dispose()
+
+        module = types.ModuleType("app.db.session")
+        module.engine = self.engine
+        module.async_engine = self.async_engine
+        module.get_engine = lambda: self.engine
+        module.get_async_engine = lambda: self.async_engine
+        module.dispose_engines = dispose_engines
+        module.SessionLocal = SessionLocal
+        module.AsyncSessionLocal = AsyncSessionLocal
+        module.get_db = get_db
+        module.get_async_db = get_async_db
+        module.get_pool_metrics = lambda: {}
+        sys.modules["app.db.session"] = module
+
+    def _install_redis(self) -> None:
+        import app.utils.redis_client as redis_client_module
+
+        redis_client_module.redis_client = self.redis
+        redis_client_module.async_redis_client = self.async_redis
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+def install(workdir: Path) -> StandIns:
+    workdir.mkdir(parents=True, exist_ok=True)
+    return StandIns(workdir)
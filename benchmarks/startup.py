@@ -0,0 +1,106 @@
+"""
+Startup benchmark: import time and time-to-first-request, each run in a fresh
+interpreter so nothing is cached between runs.
+
+    python -m benchmarks.startup --runs 10 --output startup.json
+
+Phases (milliseconds, per run):
+  import_app          `import app` (what Celery workers and scripts pay)
+  start_application   importing routers/services and building the FastAPI app
+  startup_events      lifespan startup handlers (user cache listener, ...)
+  first_request       GET /health through the full middleware stack
+  process             parent-measured wall time, interpreter start to exit
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.standins import REPO_ROOT
+
+SCHEMA_VERSION = 1
+
+# Runs in the child; stand-ins replace Postgres/Redis so startup never waits on them
+CHILD = r"""
+import json, tempfile, time
+from pathlib import Path
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+from benchmarks import standins
+workdir = tempfile.mkdtemp(prefix="appointment-startup-")
+standins.install(Path(workdir))
+t2 = time.perf_counter()
+from fastapi.testclient import TestClient
+from app import start_application
+from app.config import config
+application = start_application()
+t3 = time.perf_counter()
+with TestClient(application) as client:
+    t4 = time.perf_counter()
+    response = client.get(f"{config.API_PREFIX or ''}/health")
+    t5 = time.perf_counter()
+assert response.status_code == 200, response.text
+print(json.dumps({
+    "import_app": t1 - t0,
+    "start_application": t3 - t2,
+    "startup_events": t4 - t3,
+    "first_request": t5 - t4,
+}))
+"""
+
+
+def run_once() -> dict:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"startup run failed:\n{completed.stderr[-2000:]}")
+    phases = json.loads(completed.stdout.strip().splitlines()[-1])
+    phases["process"] = elapsed
+    return phases
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write JSON results here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    runs = [run_once() for _ in range(args.runs)]
+    results = {}
+    for phase in runs[0]:
+        samples = [run[phase] * 1000 for run in runs]
+        results[phase] = {
+            "median_ms": round(statistics.median(samples), 2),
+            "min_ms": round(min(samples), 2),
+            "max_ms": round(max(samples), 2),
+        }
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
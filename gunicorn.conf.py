@@ -0,0 +1,43 @@
+# Production server: gunicorn managing uvicorn workers.
+#
+#   gunicorn -c gunicorn.conf.py main:app
+#
+# The app is imported once in the master (preload) and forked, so workers share
+# its code and the location index copy-on-write. Each worker then opens its own
+# DB/Redis connections and warms its caches before it accepts requests.
+# SIGTERM drains: workers stop accepting and get GRACEFUL_TIMEOUT seconds to
+# finish in-flight requests and run the app's shutdown handlers.
+# Aliased: gunicorn reads every module-level name here as a setting, and `config` is one
+from app.config import config as app_config
+
+bind = app_config.SERVER_BIND
+workers = app_config.WEB_CONCURRENCY
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+graceful_timeout = app_config.GRACEFUL_TIMEOUT
+timeout = app_config.WORKER_TIMEOUT
+keepalive = 5
+accesslog = "-"
+
+
+def when_ready(server):
+    # Master, after the app is loaded and before any worker is forked
+    from app.utils.location_data import get_location_index
+
+    get_location_index()
+
+
+def post_fork(server, worker):
+    from app.db.session import reset_engines_after_fork
+    from app.utils.redis_client import reset_redis_after_fork
+
+    reset_engines_after_fork()
+    reset_redis_after_fork()
+
+
+def post_worker_init(worker):
+    # Worker, before it starts accepting connections
+    if app_config.WARMUP_ON_START:
+        from app.services.warmup_service import warm_up
+
+        warm_up()
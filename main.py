@@ -1,11 +1,13 @@
 from app import start_application
+from app.config import config
 from fastapi.middleware.cors import CORSMiddleware
-import debugpy
 import uvicorn
 
-# Enable debugpy
-debugpy.listen(("localhost", 5680))
-print("Waiting for debugger to attach...")
+# Remote debugging is opt-in (DEBUGPY=1); debugpy isn't imported otherwise
+if config.DEBUGPY:
+    import debugpy
+
+    debugpy.listen(("localhost", config.DEBUGPY_PORT))
 
 # Start the FastAPI application
 app = start_application()
@@ -17,10 +19,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows GET, POST, OPTIONS, etc.
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor for list endpoints
 )
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="localhost", port=8000, reload=True)
+    uvicorn.run("main:app", host="localhost", port=8000, reload=config.UVICORN_RELOAD)
 
-    # docker compose -f docker-compose-dev.yml up -d --build redis
\ No newline at end of file
+    # docker compose -f docker-compose-dev.yml up -d --build redis
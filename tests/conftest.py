@@ -0,0 +1,16 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from benchmarks import standins as standins_module
+
+
+@pytest.fixture(scope="session")
+def standins(tmp_path_factory):
+    """SQLite + fakeredis in place of Postgres/Redis; must be installed before app.routers is imported."""
+    installed = standins_module.install(Path(tmp_path_factory.mktemp("db")))
+    yield installed
+    # aiosqlite connections run on non-daemon threads; close them before the interpreter exits
+    asyncio.run(installed.async_engine.dispose())
+    installed.close()
@@ -0,0 +1,36 @@
+import json
+from datetime import datetime
+
+
+def candidate_times(timeslots: str, slot_minutes: int):
+    from app.services.availability_service import compile_timeslots, iter_candidate_slots
+    from app.utils.local_time import LOCAL_TZ
+
+    start, end = LOCAL_TZ.localize(datetime(2030, 1, 7)), LOCAL_TZ.localize(datetime(2030, 1, 7, 23, 59))
+    return [slot.strftime("%H:%M") for slot in iter_candidate_slots(compile_timeslots(timeslots), start, end, slot_minutes)]
+
+
+def test_candidate_slots_end_inside_the_interval(standins):
+    assert candidate_times("09:00-09:45", 30) == ["09:00"]
+    assert candidate_times("09:00-10:00,14:00-14:20", 30) == ["09:00", "09:30"]
+
+
+def test_free_slots_read_naive_datetimes_as_utc_like_booking(standins):
+    from fastapi.testclient import TestClient
+
+    from app.config import config
+    from benchmarks.run import build_app, make_token
+
+    standins.redis.set("user:71", json.dumps({
+        "id": 71, "user_type": "doctor", "full_name": "Doctor", "available_timeslots": "09:00-10:00",
+    }))
+    headers = {"Authorization": f"Bearer {make_token({'user_id': 72, 'user_type': 'patient'})}"}
+    with TestClient(build_app()) as client:
+        # 03:30 UTC is 09:30 in Dhaka, so the 09:00 slot has already started
+        response = client.get(f"{config.API_PREFIX or ''}/doctors/71/free_slots", headers=headers, params={
+            "start_date": "2030-01-07T03:30:00",
+            "end_date": "2030-01-07T12:00:00",
+        })
+
+    assert response.status_code == 200, response.text
+    assert [slot[11:16] for slot in response.json()["slots"]] == ["09:30"]
@@ -0,0 +1,50 @@
+import asyncio
+import json
+from datetime import datetime, time, timedelta, timezone
+
+import httpx
+import pytest
+
+from benchmarks.run import build_app, make_token
+
+DOCTOR_ID = 1
+PATIENT_ID = 2
+DHAKA = timezone(timedelta(hours=6))
+
+
+@pytest.fixture
+def client_headers(standins):
+    standins.redis.set(f"user:{DOCTOR_ID}", json.dumps({
+        "id": DOCTOR_ID, "user_type": "doctor", "full_name": "Doctor",
+        "available_timeslots": "09:00-17:00", "consultation_fee": 500,
+    }))
+    standins.redis.set(f"user:{PATIENT_ID}", json.dumps({
+        "id": PATIENT_ID, "user_type": "patient", "full_name": "Patient",
+    }))
+    return {"Authorization": f"Bearer {make_token({'user_id': PATIENT_ID, 'user_type': 'patient'})}"}
+
+
+def test_book_appointment_with_non_utc_offset_is_stored_as_naive_utc(standins, client_headers):
+    from app.config import config
+    from app.db.models.models import Appointment
+
+    day = datetime.now(DHAKA).date() + timedelta(days=2)
+    local = datetime.combine(day, time(10, 0), tzinfo=DHAKA)
+
+    async def book():
+        transport = httpx.ASGITransport(app=build_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(f"{config.API_PREFIX or ''}/book_appointment", headers=client_headers, json={
+                "doctor_id": DOCTOR_ID,
+                "appointment_date": local.isoformat(),
+            })
+
+    response = asyncio.run(book())
+    assert response.status_code == 201, response.text
+
+    db = standins.SessionLocal()
+    try:
+        stored = db.get(Appointment, response.json()["id"])
+    finally:
+        db.close()
+    assert stored.appointment_date == datetime.combine(day, time(4, 0))
@@ -0,0 +1,36 @@
+import json
+from datetime import datetime
+
+from app.db.models.models import Appointment, AppointmentStatus
+
+
+def test_export_filters_treat_offset_bounds_as_instants(standins):
+    from fastapi.testclient import TestClient
+
+    from app.config import config
+    from benchmarks.run import build_app, make_token
+
+    db = standins.SessionLocal()
+    try:
+        # 2031-05-01 03:30 and 04:30 UTC, i.e. 09:30 and 10:30 in Dhaka
+        db.add_all([
+            Appointment(doctor_id=81, patient_id=91, appointment_date=datetime(2031, 5, 1, 3, 30), status=AppointmentStatus.CANCELLED),
+            Appointment(doctor_id=81, patient_id=92, appointment_date=datetime(2031, 5, 1, 4, 30), status=AppointmentStatus.CANCELLED),
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    headers = {"Authorization": f"Bearer {make_token({'user_id': 1, 'user_type': 'admin'})}"}
+    with TestClient(build_app()) as client:
+        response = client.get(f"{config.API_PREFIX or ''}/appointments/export", headers=headers, params={
+            "format": "ndjson",
+            "doctor_id": 81,
+            "status": "cancelled",
+            "start_date": "2031-05-01T10:00:00+06:00",
+        })
+
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines() if line]
+    assert [row["patient_id"] for row in rows] == [92]
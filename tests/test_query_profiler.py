@@ -0,0 +1,16 @@
+import logging
+
+
+def test_celery_task_runs_are_profiled(standins, caplog):
+    from app.db.query_profiler import register_query_profiler
+    from app.services.reports import reconcile_doctor_reports
+
+    register_query_profiler(standins.engine)
+    with caplog.at_level(logging.INFO, logger="app.db.query_profiler"):
+        reconcile_doctor_reports.apply()
+
+    assert any(
+        record.getMessage().startswith("app.services.reports.reconcile_doctor_reports: ")
+        and "statements" in record.getMessage()
+        for record in caplog.records
+    )
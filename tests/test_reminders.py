@@ -0,0 +1,77 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from app.db.models.models import Appointment, AppointmentStatus
+
+
+def add_appointments(standins, *appointments):
+    db = standins.SessionLocal()
+    try:
+        db.add_all(appointments)
+        db.commit()
+        for appointment in appointments:
+            db.refresh(appointment)
+        db.expunge_all()
+    finally:
+        db.close()
+    return appointments
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def test_backfill_arms_timers_for_future_confirmed_appointments_only(standins):
+    from app.services.reminder import backfill_reminder_timers
+    from app.services.reminder_timer_service import REMINDER_TIMERS_KEY
+
+    confirmed, pending, past = add_appointments(
+        standins,
+        Appointment(doctor_id=11, patient_id=21, appointment_date=utcnow() + timedelta(days=3), status=AppointmentStatus.CONFIRMED),
+        Appointment(doctor_id=11, patient_id=22, appointment_date=utcnow() + timedelta(days=3, hours=1), status=AppointmentStatus.PENDING),
+        Appointment(doctor_id=11, patient_id=23, appointment_date=utcnow() - timedelta(days=1), status=AppointmentStatus.CONFIRMED),
+    )
+    standins.redis.delete(REMINDER_TIMERS_KEY)
+
+    backfill_reminder_timers()
+
+    members = set(standins.redis.zrange(REMINDER_TIMERS_KEY, 0, -1))
+    assert members == {f"{confirmed.id}:24h", f"{confirmed.id}:1h"}
+
+
+def test_daily_and_24h_reminders_are_sent_once(standins):
+    from app.services.reminder import DAILY_REMINDER, send_reminders
+
+    standins.redis.set("user:31", json.dumps({"id": 31, "full_name": "Patient", "email": "p@example.com"}))
+    (appointment,) = add_appointments(
+        standins,
+        Appointment(doctor_id=12, patient_id=31, appointment_date=utcnow() + timedelta(hours=20), status=AppointmentStatus.CONFIRMED),
+    )
+
+    assert send_reminders([appointment], DAILY_REMINDER)["sent"] == 1
+    assert send_reminders([appointment], "24h")["sent"] == 0
+    assert send_reminders([appointment], "1h")["sent"] == 1
+
+
+def test_failed_send_rearms_its_timer(standins, monkeypatch):
+    from app.config import config
+    from app.services import reminder
+    from app.services.reminder_timer_service import REMINDER_TIMERS_KEY
+
+    standins.redis.set("user:32", json.dumps({"id": 32, "full_name": "Patient", "email": "p@example.com"}))
+    (appointment,) = add_appointments(
+        standins,
+        Appointment(doctor_id=13, patient_id=32, appointment_date=utcnow() + timedelta(minutes=30), status=AppointmentStatus.CONFIRMED),
+    )
+    standins.redis.delete(REMINDER_TIMERS_KEY)
+    standins.redis.zadd(REMINDER_TIMERS_KEY, {f"{appointment.id}:1h": 0})
+
+    def fail(*args):
+        raise ConnectionError("mail server down")
+
+    monkeypatch.setattr(reminder, "deliver_reminder", fail)
+    before = datetime.now(timezone.utc).timestamp()
+    assert reminder.drain_due_reminders()["failed"] == 1
+
+    due_at = standins.redis.zscore(REMINDER_TIMERS_KEY, f"{appointment.id}:1h")
+    assert due_at is not None and due_at >= before + config.REMINDER_RETRY_DELAY
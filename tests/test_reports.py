@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+
+from app.db.models.models import Appointment, AppointmentStatus
+
+
+def test_reconcile_bumps_cache_version_only_when_rows_change(standins):
+    from app.services.doctor_report_service import current_month
+    from app.services.report_cache_service import current_reports_version
+    from app.services.reports import reconcile_doctor_reports
+
+    db = standins.SessionLocal()
+    try:
+        db.add(Appointment(
+            doctor_id=41, patient_id=51, status=AppointmentStatus.COMPLETED,
+            appointment_date=datetime.now(timezone.utc).replace(tzinfo=None),
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+    year, month = current_month()
+    versions = lambda: (current_reports_version(), current_reports_version(year, month), current_reports_version(2000, 1))
+    before = versions()
+    assert reconcile_doctor_reports() > 0
+    # Only responses that can include the corrected month are invalidated
+    assert versions() == (before[0] + 1, before[1] + 1, before[2])
+
+    # Nothing drifted since: cached report bodies must stay valid
+    assert reconcile_doctor_reports() == 0
+    assert versions() == (before[0] + 1, before[1] + 1, before[2])
+
+
+def test_booking_change_only_invalidates_its_month(standins):
+    from app.services.report_cache_service import bump_reports_version, get_or_build
+
+    def cached(year, month):
+        return get_or_build("summary", (year, month), lambda: f"{year}-{month}", year=year, month=month)[1]
+
+    march, april, year_2031, everything = cached(2031, 3), cached(2031, 4), cached(2031, None), cached(None, None)
+    bump_reports_version([(2031, 4)])
+
+    assert cached(2031, 3) == march
+    assert cached(2031, 4) != april
+    assert cached(2031, None) != year_2031
+    assert cached(None, None) != everything
+
+
+def get_reports(path: str, token_payload=None, params=None):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.routers.report_router import report_router
+    from benchmarks.run import make_token
+
+    app = FastAPI()
+    app.include_router(report_router)
+    headers = {"Authorization": f"Bearer {make_token(token_payload)}"} if token_payload else {}
+    with TestClient(app) as client:
+        return client.get(f"{report_router.prefix}{path}", headers=headers, params=params)
+
+
+def test_reports_require_admin_or_own_doctor(standins):
+    from app.db.models.models import DoctorReport
+
+    db = standins.SessionLocal()
+    try:
+        db.add_all([
+            DoctorReport(doctor_id=61, year=2030, month=1, total_appointments=3, total_patient_visits=2, total_earnings=1000.0),
+            DoctorReport(doctor_id=62, year=2030, month=1, total_appointments=5, total_patient_visits=5, total_earnings=2500.0),
+        ])
+        db.commit()
+    finally:
+        db.close()
+    params = {"year": 2030, "month": 1}
+
+    assert get_reports("/monthly", params=params).status_code in (401, 403)
+    assert get_reports("/monthly", {"user_id": 71, "user_type": "patient"}, params).status_code == 403
+    assert get_reports("/monthly/summary", {"user_id": 61, "user_type": "doctor"}, params).status_code == 403
+
+    # A doctor asking for someone else's rows still only gets their own
+    own = get_reports("/monthly", {"user_id": 61, "user_type": "doctor"}, dict(params, doctor_id=62))
+    assert own.status_code == 200
+    assert [row["doctor_id"] for row in own.json()] == [61]
+
+    admin = {"user_id": 1, "user_type": "admin"}
+    assert {row["doctor_id"] for row in get_reports("/monthly", admin, params).json()} == {61, 62}
+    assert get_reports("/monthly/summary", admin, params).json()["total_appointments"] == 8
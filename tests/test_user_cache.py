@@ -0,0 +1,44 @@
+import json
+import time
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_external_write_to_user_key_evicts_l1_copy(standins):
+    from app.services import cache_user_service
+
+    standins.redis.config_set("notify-keyspace-events", cache_user_service.KEYSPACE_EVENT_FLAGS)
+    standins.redis.set("user:901", json.dumps({"id": 901, "full_name": "Before"}))
+    cache_user_service.start_user_cache_listener()
+    try:
+        assert wait_for(lambda: cache_user_service.get_user_cache_stats()["invalidation_listener"])
+        assert cache_user_service.get_user_info(901)["full_name"] == "Before"
+        # Written by another service, which publishes nothing itself
+        standins.redis.set("user:901", json.dumps({"id": 901, "full_name": "After"}))
+        assert wait_for(lambda: cache_user_service.get_user_info(901)["full_name"] == "After")
+    finally:
+        cache_user_service.stop_user_cache_listener()
+
+
+def test_listener_start_does_not_need_redis(standins, monkeypatch):
+    import redis
+
+    from app.services import cache_user_service
+
+    unreachable = redis.Redis(host="127.0.0.1", port=6399, socket_connect_timeout=0.2, decode_responses=True)
+    monkeypatch.setattr(cache_user_service, "redis_client", unreachable)
+    cache_user_service.start_user_cache_listener()
+    try:
+        time.sleep(0.3)
+        stats = cache_user_service.get_user_cache_stats()
+        assert stats["invalidation_listener"] is False
+        assert stats["keyspace_events"] is False
+    finally:
+        cache_user_service.stop_user_cache_listener()